@@ -2,9 +2,8 @@
 import streamlit as st
 
 # 2. Other imports
+import os
 import urllib.parse
-import google.generativeai as genai
-from PyPDF2 import PdfReader
 from datetime import datetime, date
 from docx import Document
 from fpdf import FPDF
@@ -15,6 +14,8 @@ import re
 import base64
 import io
 import numpy as np
+from utils import llm, prompts, resume_analysis, resume_cache, resume_structure, telemetry
+from utils.jobs import JobPosting
 
 # Password lock function
 def password_protect():
@@ -132,40 +133,43 @@ if not password_protect():
 
 
 # 4. Configure Gemini API using Streamlit secrets
+@st.cache_resource(show_spinner=False)
+def get_llm_client():
+    """Process-wide LLM client, configured and resolved once per server process.
+
+    LLM_BACKEND picks the backend (default "gemini"); GEMINI_API_ENDPOINT
+    points the Gemini client at another endpoint such as benchmarks/stub_llm.py.
+    LLM_METRICS_PORT serves per-feature Prometheus metrics at :PORT/metrics.
+    """
+    client = llm.get_client(st.secrets["GOOGLE_API_KEY"])
+    if os.environ.get("LLM_METRICS_PORT"):
+        telemetry.serve(llm.metrics, int(os.environ["LLM_METRICS_PORT"]))
+    return client
+
 try:
-    genai.configure(api_key=st.secrets["GOOGLE_API_KEY"])
+    get_llm_client()
 except KeyError:
     st.error("GOOGLE_API_KEY not found in Streamlit secrets. Please configure it in Streamlit Cloud settings.")
     st.stop()
+except llm.ModelUnavailable as e:
+    st.error(f"Error: Could not load a Gemini model. {str(e)}")
+    st.error("Please update llm.PREFERRED_MODELS to one of the available models and redeploy.")
+    st.stop()
+except ValueError as e:
+    st.error(f"Error: {str(e)}")
+    st.stop()
+
+# Re-checked at most every few minutes; switches to a fallback model if the active one was retired.
+if not get_llm_client().health_check():
+    st.warning("⚠️ The AI service is not responding right now, so AI features may fail. Please try again shortly.")
 
 # ----------------- HELPER FUNCTIONS -----------------
-def get_gemini_model():
-    """Initialize and return the Gemini model."""
-    model_name = 'gemini-1.5-flash'  # Updated model name
+def load_resume_file(resume_file):
+    """Parse a PDF, DOCX or TXT resume into text, sections, skills and contact details (once per distinct file)."""
     try:
-        return genai.GenerativeModel(model_name)
+        return resume_cache.load_resume(resume_file)
     except Exception as e:
-        # If the model is not found, list available models
-        st.error(f"Error: Could not load model {model_name}. Details: {str(e)}")
-        try:
-            models = genai.list_models()
-            available_models = [m.name for m in models if 'generateContent' in m.supported_generation_methods]
-            st.error(f"Available models: {', '.join(available_models)}")
-            st.error("Please update the model name in the code to one of the available models and redeploy.")
-        except Exception as list_error:
-            st.error(f"Could not list available models: {str(list_error)}")
-        st.stop()
-
-def pdf_to_text(pdf_file):
-    """Extract text from a PDF resume."""
-    try:
-        reader = PdfReader(pdf_file)
-        text = ''
-        for page in reader.pages:
-            text += str(page.extract_text() or '')
-        return text
-    except Exception as e:
-        st.error(f"Failed to process PDF: {str(e)}")
+        st.error(f"Failed to process resume: {str(e)}")
         return None
 
 def construct_score_prompt(resume, job_description):
@@ -196,14 +200,42 @@ def construct_improvement_prompt(resume, job_description):
     Job Description: {job_description}
     '''
 
-def get_result(prompt):
-    """Get response from Gemini model."""
+def get_result(prompt, feature="other", use_cache=True):
+    """Get response from Gemini model (cached unless ``use_cache`` is False).
+
+    ``feature`` tags the call in the LLM metrics. On failure the reason is
+    shown with ``st.error`` and None is returned.
+    """
     try:
-        model = get_gemini_model()
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"Error: Could not process request with Gemini LLM. Details: {str(e)}"        
+        return get_llm_client().generate_text(prompt, use_cache=use_cache, feature=feature)
+    except llm.LLMError as e:
+        st.error(e.user_message)
+        return None
+
+def stream_result(prompt, feature="other", use_cache=True):
+    """Yield the Gemini response in chunks; failures raise ``llm.LLMError``."""
+    return get_llm_client().stream_text(prompt, use_cache=use_cache, feature=feature)
+
+def show_result(prompt, feature="other", container=st, use_cache=True):
+    """Render the response into ``container`` as it streams in and return the full text.
+
+    On failure the reason is shown in ``container`` and None is returned.
+    """
+    try:
+        return container.write_stream(stream_result(prompt, feature, use_cache=use_cache))
+    except llm.LLMError as e:
+        container.error(e.user_message)
+        return None
+
+def get_results_concurrently(prompt_list, features=None):
+    """Run independent prompts in parallel and return the responses in order (None where a call failed)."""
+    results = [None] * len(prompt_list)
+    for index, text, error in llm.iter_generate_concurrently(prompt_list, client=get_llm_client(), features=features):
+        if error is not None:
+            st.error(llm.classify(error).user_message)
+        results[index] = text
+    return results
+
 # ----------------- LANGUAGE SUPPORT -----------------
 LANGUAGES = {
     "English": "en",
@@ -236,7 +268,7 @@ TRANSLATIONS = {
         "experience_options": ["Any", "Entry", "Mid", "Senior", "Executive"],
         "date_posted_options": ["Any time", "Past month", "Past week", "Past 24 hours"],
         "resume_analysis": "Resume Analysis",
-        "upload_resume": "Upload Your Resume (PDF)",
+        "upload_resume": "Upload Your Resume (PDF, DOCX, TXT)",
         "analyze_resume": "Analyze Resume",
     },
     "hi": {
@@ -258,7 +290,7 @@ TRANSLATIONS = {
         "experience_options": ["कोई भी", "प्रारंभिक", "मध्य", "वरिष्ठ", "कार्यकारी"],
         "date_posted_options": ["कभी भी", "पिछला महीना", "पिछला सप्ताह", "पिछले 24 घंटे"],
         "resume_analysis": "रिज्यूमे विश्लेषण",
-        "upload_resume": "अपना रिज्यूमे अपलोड करें (PDF)",
+        "upload_resume": "अपना रिज्यूमे अपलोड करें (PDF, DOCX, TXT)",
         "analyze_resume": "रिज्यूमे का विश्लेषण करें",
     },
     "ta": {
@@ -280,7 +312,7 @@ TRANSLATIONS = {
         "experience_options": ["எதுவும்", "ஆரம்பம்", "நடுத்தரம்", "மூத்தவர்", "நிர்வாகி"],
         "date_posted_options": ["எப்போது வேண்டுமானாலும்", "கடந்த மாதம்", "கடந்த வாரம்", "கடந்த 24 மணி நேரம்"],
         "resume_analysis": "ரெஸ்யூமே பகுப்பாய்வு",
-        "upload_resume": "உங்கள் ரெஸ்யூமேவை பதிவேற்றவும் (PDF)",
+        "upload_resume": "உங்கள் ரெஸ்யூமேவை பதிவேற்றவும் (PDF, DOCX, TXT)",
         "analyze_resume": "ரெஸ்யூமேவை பகுப்பாய்வு செய்யவும்",
     },
     "te": {
@@ -302,7 +334,7 @@ TRANSLATIONS = {
         "experience_options": ["ఏదైనా", "ఎంట్రీ", "మధ్యస్థం", "సీనియర్", "ఎగ్జిక్యూటివ్"],
         "date_posted_options": ["ఏ సమయంలోనైనా", "గత నెల", "గత వారం", "గత 24 గంటలు"],
         "resume_analysis": "రెజ్యూమ్ విశ్లేషణ",
-        "upload_resume": "మీ రెజ్యూమ్‌ను అప్‌లోడ్ చేయండి (PDF)",
+        "upload_resume": "మీ రెజ్యూమ్‌ను అప్‌లోడ్ చేయండి (PDF, DOCX, TXT)",
         "analyze_resume": "రెజ్యూమ్ విశ్లేషించండి",
     },
     "ml": {
@@ -324,7 +356,7 @@ TRANSLATIONS = {
         "experience_options": ["ഏതെങ്കിലും", "എൻട്രി", "മധ്യ", "സീനിയർ", "എക്‌സിക്യൂട്ടീവ്"],
         "date_posted_options": ["ഏത് സമയത്തും", "കഴിഞ്ഞ മാസം", "കഴിഞ്ഞ ആഴ്ച", "കഴിഞ്ഞ 24 മണിക്കൂർ"],
         "resume_analysis": "റെസ്യൂം വിശകലനം",
-        "upload_resume": "നിന്റെ റെസ്യൂം അപ്‌ലോഡ് ചെയ്യുക (PDF)",
+        "upload_resume": "നിന്റെ റെസ്യൂം അപ്‌ലോഡ് ചെയ്യുക (PDF, DOCX, TXT)",
         "analyze_resume": "റെസ്യൂം വിശകലനം ചെയ്യുക",
     },
     "fr": {
@@ -346,7 +378,7 @@ TRANSLATIONS = {
         "experience_options": ["Tout", "Débutant", "Intermédiaire", "Confirmé", "Cadre"],
         "date_posted_options": ["N'importe quand", "Le mois dernier", "La semaine dernière", "Les dernières 24 heures"],
         "resume_analysis": "Analyse de CV",
-        "upload_resume": "Téléchargez votre CV (PDF)",
+        "upload_resume": "Téléchargez votre CV (PDF, DOCX, TXT)",
         "analyze_resume": "Analyser le CV",
     },
     "de": {
@@ -368,7 +400,7 @@ TRANSLATIONS = {
         "experience_options": ["Beliebig", "Einsteiger", "Mittel", "Senior", "Führungskraft"],
         "date_posted_options": ["Jederzeit", "Letzter Monat", "Letzte Woche", "Letzte 24 Stunden"],
         "resume_analysis": "Lebenslauf-Analyse",
-        "upload_resume": "Laden Sie Ihren Lebenslauf hoch (PDF)",
+        "upload_resume": "Laden Sie Ihren Lebenslauf hoch (PDF, DOCX, TXT)",
         "analyze_resume": "Lebenslauf analysieren",
     },
     "ar": {
@@ -390,7 +422,7 @@ TRANSLATIONS = {
         "experience_options": ["أي", "مبتدئ", "متوسط", "كبير", "تنفيذي"],
         "date_posted_options": ["في أي وقت", "الشهر الماضي", "الأسبوع الماضي", "آخر 24 ساعة"],
         "resume_analysis": "تحليل السيرة الذاتية",
-        "upload_resume": "قم بتحميل سيرتك الذاتية (PDF)",
+        "upload_resume": "قم بتحميل سيرتك الذاتية (PDF, DOCX, TXT)",
         "analyze_resume": "تحليل السيرة الذاتية",
     },
 }
@@ -420,6 +452,18 @@ st.sidebar.markdown("""
 📥 **Get the AI Starter Kit instantly after payment**
 """, unsafe_allow_html=True)
 
+# Per-feature LLM latency/token dashboard for operators (set LLM_DASHBOARD=1)
+if os.environ.get("LLM_DASHBOARD"):
+    with st.sidebar.expander("📈 AI Feature Metrics"):
+        metric_rows = llm.metrics.summary()
+        if metric_rows:
+            st.dataframe(pd.DataFrame(metric_rows).set_index("feature"))
+        else:
+            st.caption("No AI calls yet.")
+        st.json(llm.stats())
+        st.download_button("Download Prometheus metrics", llm.metrics.prometheus(),
+                           file_name="llm_metrics.prom", mime="text/plain")
+
 # Hide Streamlit default elements
 st.markdown("""
     <style>
@@ -915,26 +959,26 @@ with prep_tab:
         Ensure the question is realistic, specific, and relevant to 2025 job trends.
         Return only the question as a single sentence.
         """
-        mock_question = get_result(mock_prompt)
-        st.markdown(f"**Question**: {mock_question}")
+        mock_question = get_result(mock_prompt, "mock_question")
+        if mock_question:
+            st.markdown(f"**Question**: {mock_question}")
         
-        with st.form("mock_answer_form"):
-            user_answer = st.text_area("Your Answer", height=150, key="mock_answer")
-            feedback_submit = st.form_submit_button("Get AI Feedback")
+            with st.form("mock_answer_form"):
+                user_answer = st.text_area("Your Answer", height=150, key="mock_answer")
+                feedback_submit = st.form_submit_button("Get AI Feedback")
         
-        if feedback_submit and user_answer.strip():
-            feedback_prompt = f"""
-            Act as a career coach with 15 years of experience. Review the user's answer to the following {mock_question_type.lower()} interview question for a {mock_role} role: "{mock_question}".
-            User Answer: "{user_answer}"
-            Provide concise feedback focusing on:
-            1. Clarity and structure
-            2. Relevance to the question
-            3. Suggestions for improvement
-            Return the feedback in a bullet-point format.
-            """
-            feedback = get_result(feedback_prompt)
-            st.markdown("**AI Feedback**")
-            st.markdown(feedback)
+            if feedback_submit and user_answer.strip():
+                feedback_prompt = f"""
+                Act as a career coach with 15 years of experience. Review the user's answer to the following {mock_question_type.lower()} interview question for a {mock_role} role: "{mock_question}".
+                User Answer: "{user_answer}"
+                Provide concise feedback focusing on:
+                1. Clarity and structure
+                2. Relevance to the question
+                3. Suggestions for improvement
+                Return the feedback in a bullet-point format.
+                """
+                st.markdown("**AI Feedback**")
+                feedback = show_result(feedback_prompt, "mock_feedback")
 
     # Interactive STAR Method Guide
     st.subheader("🌟 Craft STAR Stories")
@@ -973,9 +1017,8 @@ with prep_tab:
                     Result: {story['Result']}
                     Provide feedback on structure, impact, and suggestions for improvement in bullet points.
                     """
-                    star_feedback = get_result(star_feedback_prompt)
                     st.markdown("**AI Feedback on STAR Story**")
-                    st.markdown(star_feedback)
+                    star_feedback = show_result(star_feedback_prompt, "star_feedback")
 
 # Resume Analysis (Enhanced with Interview Question Suggestions)
 with resume_tab:
@@ -985,7 +1028,7 @@ with resume_tab:
         with col1:
             job_description = st.text_area("Enter the Job Description", height=200, key="resume_job_desc")
         with col2:
-            uploaded_file = st.file_uploader(t["upload_resume"], type=['pdf'], key="resume_upload")
+            uploaded_file = st.file_uploader(t["upload_resume"], type=['pdf', 'docx', 'txt'], key="resume_upload")
         
         analyze_submitted = st.form_submit_button(t["analyze_resume"])
 
@@ -996,31 +1039,59 @@ with resume_tab:
             st.error("Please upload your resume.")
         else:
             try:
-                # Extract resume text
-                resume_text = pdf_to_text(uploaded_file)
+                # Extract resume text, then compress and budget it once for all three prompts
+                parsed_resume = load_resume_file(uploaded_file)
+                raw_resume = parsed_resume["text"] if parsed_resume else ""
+                resume_text = prompts.prepare_resume(raw_resume)
+                if parsed_resume:
+                    st.session_state.parsed_resume = parsed_resume
+                    local_match = resume_structure.match_skills(parsed_resume["skills"], job_description)
+                    if local_match["score"] is not None:
+                        st.caption(
+                            f"Instant skill match: {local_match['score']}/10 · "
+                            f"matched: {', '.join(local_match['matched']) or 'none'} · "
+                            f"missing: {', '.join(local_match['missing']) or 'none'}"
+                        )
+                # Interview questions only need what the candidate has done and can do.
+                question_context = resume_text
+                if parsed_resume:
+                    question_context = prompts.prepare_resume(resume_structure.section_text(
+                        parsed_resume["sections"], ("skills", "experience", "projects"))) or resume_text
                 
-                # Get match score
+                # One structured request covers all three sections; the per-section
+                # prompts are only sent for sections whose JSON did not validate.
                 score_prompt = construct_score_prompt(resume_text, job_description)
-                score_result = get_result(score_prompt)
-                st.subheader("Resume Match Score")
-                st.markdown(score_result)
-                
-                # Get improvement suggestions
                 improvement_prompt = construct_improvement_prompt(resume_text, job_description)
-                improvement_result = get_result(improvement_prompt)
-                st.subheader("Suggestions to Improve Your Resume")
-                st.markdown(improvement_result)
-                
-                # Suggest interview questions based on resume analysis
                 question_prompt = f"""
                 Based on the resume and job description below, suggest 3 interview questions (1 technical, 1 behavioral, 1 role-specific) that the candidate should prepare for.
-                Resume: {resume_text}
+                Resume: {question_context}
                 Job Description: {job_description}
                 Return the questions in a bullet-point format.
                 """
-                suggested_questions = get_result(question_prompt)
-                st.subheader("Recommended Interview Questions to Prepare")
-                st.markdown(suggested_questions)
+                sections = {
+                    "score": ("Resume Match Score", score_prompt),
+                    "improvements": ("Suggestions to Improve Your Resume", improvement_prompt),
+                    "questions": ("Recommended Interview Questions to Prepare", question_prompt),
+                }
+                placeholders = {}
+                for name, (title, _) in sections.items():
+                    st.subheader(title)
+                    placeholders[name] = st.empty()
+                    placeholders[name].info("⏳ Generating...")
+                fallback_prompts = {name: prompt for name, (_, prompt) in sections.items()}
+                for name, text, error in resume_analysis.iter_analysis(
+                        resume_text, job_description, fallback_prompts, client=get_llm_client()):
+                    if error is not None:
+                        placeholders[name].error(llm.classify(error).user_message)
+                    else:
+                        placeholders[name].markdown(text)
+                before, after = prompts.estimate_tokens(raw_resume), prompts.estimate_tokens(resume_text)
+                total = llm.usage.snapshot()
+                st.caption(
+                    f"Resume context: ~{before:,} → ~{after:,} tokens per prompt. "
+                    f"Gemini usage since start: {total['prompt_tokens']:,} input / {total['output_tokens']:,} output tokens "
+                    f"over {total['calls']} calls."
+                )
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
 from docx import Document
@@ -1041,19 +1112,42 @@ with ats_tab:
     if 'resume_analysis' not in st.session_state:
         st.session_state.resume_analysis = None
 
+    import_file = st.file_uploader("Import details from an existing resume (optional)", type=['pdf', 'docx', 'txt'],
+                                   key="ats_import")
+    if import_file is not None:
+        imported = load_resume_file(import_file)
+        imported_id = resume_cache.content_hash(resume_cache.read_upload(import_file))
+        # Prefill once per file so later edits in the form are not overwritten on rerun.
+        if imported and st.session_state.get("ats_imported") != imported_id:
+            sections, contact = imported["sections"], imported["contact"]
+            st.session_state.update({
+                "ats_full_name": contact["name"],
+                "ats_email": contact["email"],
+                "ats_phone": contact["phone"],
+                "ats_linkedin": contact["linkedin"],
+                "ats_education": sections.get("education", ""),
+                "ats_certifications": sections.get("certifications", ""),
+                "ats_skills": ", ".join(imported["skills"]) or sections.get("skills", ""),
+                "ats_projects": sections.get("projects", ""),
+                "ats_languages": sections.get("languages", ""),
+                "ats_experience": sections.get("experience", ""),
+                "ats_imported": imported_id,
+            })
+            st.success("✅ Details imported from your resume. Review them below before generating.")
+
     with st.form("resume_builder_form"):
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### 📝 Personal Information")
-            full_name = st.text_input("Full Name*")
-            email = st.text_input("Email*")
-            phone = st.text_input("Phone*")
-            linkedin = st.text_input("LinkedIn URL")
+            full_name = st.text_input("Full Name*", key="ats_full_name")
+            email = st.text_input("Email*", key="ats_email")
+            phone = st.text_input("Phone*", key="ats_phone")
+            linkedin = st.text_input("LinkedIn URL", key="ats_linkedin")
             
             st.markdown("### 🎓 Education & Certifications")
-            education = st.text_area("Education*", help="Include degree, institution, and year")
-            certifications = st.text_area("Certifications", help="List relevant certifications")
+            education = st.text_area("Education*", help="Include degree, institution, and year", key="ats_education")
+            certifications = st.text_area("Certifications", help="List relevant certifications", key="ats_certifications")
             
         with col2:
             st.markdown("### 💼 Target Role")
@@ -1063,15 +1157,17 @@ with ats_tab:
                               
             st.markdown("### 🛠 Skills")
             skills = st.text_area("Skills (comma-separated)*", 
-                                help="Include both technical and soft skills relevant to your target role")
+                                help="Include both technical and soft skills relevant to your target role",
+                                key="ats_skills")
             
             st.markdown("### 📌 Optional Sections")
-            projects = st.text_area("Key Projects", help="Describe 2-3 key projects with impact")
-            languages = st.text_input("Languages", help="List languages you speak")
+            projects = st.text_area("Key Projects", help="Describe 2-3 key projects with impact", key="ats_projects")
+            languages = st.text_input("Languages", help="List languages you speak", key="ats_languages")
         
         st.markdown("### 🏢 Work Experience")
         experience = st.text_area("Work Experience*", 
-                                help="Include company names, job titles, dates, and bullet points of achievements")
+                                help="Include company names, job titles, dates, and bullet points of achievements",
+                                key="ats_experience")
         
         st.markdown("### 🔍 ATS Optimization")
         use_ats_keywords = st.checkbox("Include ATS-friendly keywords", value=True)
@@ -1110,7 +1206,7 @@ with ats_tab:
             if languages:
                 resume_content += f"\nLANGUAGES:\n{languages}"
             
-            # Generate AI analysis
+            # Generate AI analysis and the professional summary in parallel
             with st.spinner("🤖 AI is analyzing your resume..."):
                 analysis_prompt = f"""
                 Analyze this resume for a {role} position and provide specific improvement suggestions:
@@ -1121,7 +1217,7 @@ with ats_tab:
                 5. Summary: Generate a powerful professional summary
                 
                 Resume Content:
-                {resume_content}
+                {prompts.prepare_resume(resume_content)}
                 
                 Provide output in this format:
                 
@@ -1131,16 +1227,16 @@ with ats_tab:
                 **Suggested Improvements**: [bulleted list]
                 **Generated Professional Summary**: [text]
                 """
+                summary_prompt = f"Generate a 3-sentence professional summary for a {role} with these skills: {skills}"
                 
-                st.session_state.resume_analysis = get_result(analysis_prompt)
+                st.session_state.resume_analysis, professional_summary = get_results_concurrently(
+                    [analysis_prompt, summary_prompt], features=["ats_analysis", "ats_summary"])
+                professional_summary = professional_summary or ""
             
             st.success("✅ ATS-Optimized Resume Generated!")
             st.markdown("---")
-            st.markdown(st.session_state.resume_analysis)
-            
-            # Generate professional summary
-            summary_prompt = f"Generate a 3-sentence professional summary for a {role} with these skills: {skills}"
-            professional_summary = get_result(summary_prompt)
+            if st.session_state.resume_analysis:
+                st.markdown(st.session_state.resume_analysis)
             
             # Create text version
             formatted_resume = f"""
@@ -1348,34 +1444,37 @@ with ats_tab:
                             6. Professional sign-off
                             """
                             
-                            cover_letter = get_result(cover_prompt)
-                            st.text_area("Generated Cover Letter", cover_letter, height=400)
+                            # Stream the draft as it is written, then swap in the editable text area
+                            cover_placeholder = st.empty()
+                            cover_letter = show_result(cover_prompt, "cover_letter", cover_placeholder.container())
+                            if cover_letter:
+                                cover_placeholder.text_area("Generated Cover Letter", cover_letter, height=400)
                             
-                            # Download buttons for cover letter
-                            cl_col1, cl_col2 = st.columns(2)
-                            with cl_col1:
-                                st.download_button(
-                                    label="📥 Download TXT Cover Letter",
-                                    data=cover_letter,
-                                    file_name=f"{full_name.replace(' ', '_')}_Cover_Letter.txt",
-                                    mime="text/plain"
-                                )
-                            with cl_col2:
-                                # Create DOCX version of cover letter
-                                from docx import Document
-                                doc = Document()
-                                doc.add_paragraph(cover_letter)
+                                # Download buttons for cover letter
+                                cl_col1, cl_col2 = st.columns(2)
+                                with cl_col1:
+                                    st.download_button(
+                                        label="📥 Download TXT Cover Letter",
+                                        data=cover_letter,
+                                        file_name=f"{full_name.replace(' ', '_')}_Cover_Letter.txt",
+                                        mime="text/plain"
+                                    )
+                                with cl_col2:
+                                    # Create DOCX version of cover letter
+                                    from docx import Document
+                                    doc = Document()
+                                    doc.add_paragraph(cover_letter)
                                 
-                                cover_buffer = BytesIO()
-                                doc.save(cover_buffer)
-                                cover_buffer.seek(0)
+                                    cover_buffer = BytesIO()
+                                    doc.save(cover_buffer)
+                                    cover_buffer.seek(0)
                                 
-                                st.download_button(
-                                    label="📄 Download DOCX Cover Letter",
-                                    data=cover_buffer,
-                                    file_name=f"{full_name.replace(' ', '_')}_Cover_Letter.docx",
-                                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                                )
+                                    st.download_button(
+                                        label="📄 Download DOCX Cover Letter",
+                                        data=cover_buffer,
+                                        file_name=f"{full_name.replace(' ', '_')}_Cover_Letter.docx",
+                                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                                    )
             
 # LINKEDIN OPTIMIZATION TIPS
 st.markdown("---")
@@ -1422,16 +1521,16 @@ Provide recommendations in this format:
 **Networking & Visibility Tips**:
 - Tips to expand connections and endorsements
 """
-            linkedin_analysis = get_result(linkedin_prompt)
-            st.markdown(linkedin_analysis)
+            linkedin_analysis = show_result(linkedin_prompt, "linkedin")
 
-            # Download LinkedIn report as TXT
-            st.download_button(
-                label="📥 Download LinkedIn Report (TXT)",
-                data=linkedin_analysis,
-                file_name=f"{full_name.replace(' ', '_')}_LinkedIn_Report.txt",
-                mime="text/plain"
-            )
+            if linkedin_analysis:
+                # Download LinkedIn report as TXT
+                st.download_button(
+                    label="📥 Download LinkedIn Report (TXT)",
+                    data=linkedin_analysis,
+                    file_name=f"{full_name.replace(' ', '_')}_LinkedIn_Report.txt",
+                    mime="text/plain"
+                )
     else:
         st.info("Please enter your LinkedIn URL above to personalize optimization tips.")
 
@@ -1919,14 +2018,15 @@ with tab5:
         
         if search_clicked:
             # Filter jobs by job type and salary range
-            jobs_to_show = fake_jobs.get(sponsor_country, [
+            jobs_to_show = [JobPosting.from_dict(job) for job in fake_jobs.get(sponsor_country, [
                 {"title": "IT Specialist", "company": "TechSolutions", "location": sponsor_country, "visa": "✔️ Work visa sponsorship", "salary": "Competitive", "type": "Full-Time"}
-            ])
+            ])]
             if job_type != "Full-Time":
-                jobs_to_show = [job for job in jobs_to_show if job["type"] == job_type]
+                jobs_to_show = [job for job in jobs_to_show if job.job_type == job_type]
             if salary_range != "Any":
-                min_salary = int(salary_range.split("-")[0].replace("$", "").replace(",", ""))
-                jobs_to_show = [job for job in jobs_to_show if "Competitive" in job["salary"] or int(job["salary"].split()[0].replace(",", "").replace("CAD", "").replace("£", "").replace("€", "").replace("DKK", "").replace("NOK", "").replace("SEK", "").replace("CHF", "")) >= min_salary]
+                min_salary = int(salary_range.split("-")[0].replace("$", "").replace(",", "").replace("+", ""))
+                # "Competitive" and other figure-less salaries have no parsed amount and are kept.
+                jobs_to_show = [job for job in jobs_to_show if job.salary_amount is None or job.salary_amount >= min_salary]
             
             st.success(f"Showing visa-sponsored {job_type} jobs in {sponsor_country} for '{job_keyword}' (Salary: {salary_range})")
             
@@ -1935,16 +2035,16 @@ with tab5:
                 with st.container():
                     st.markdown(f"""
                     <div style="padding:15px; border-radius:10px; background-color:#66BB6A; margin-bottom:10px;">
-                        <h4>{job['title']}</h4>
-                        <p>🏢 <b>{job['company']}</b> | 📍 {job['location']} | 💰 {job['salary']}</p>
-                        <p>{job['visa']}</p>
+                        <h4>{job.title}</h4>
+                        <p>🏢 <b>{job.company}</b> | 📍 {job.location} | 💰 {job.salary}</p>
+                        <p>{job.visa}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     col_btn1, col_btn2 = st.columns([1, 5])
                     with col_btn1:
-                        st.button("Apply", key=f"apply_{job['title']}_{job['company']}")
+                        st.button("Apply", key=f"apply_{job.title}_{job.company}")
                     with col_btn2:
-                        st.button("Save Job", key=f"save_{job['title']}_{job['company']}")
+                        st.button("Save Job", key=f"save_{job.title}_{job.company}")
             
             st.markdown("""
             <div style="background-color:#e3f2fd; padding:15px; border-radius:10px; margin-top:20px;">
@@ -2565,9 +2665,8 @@ with tab5:
         - **Processing Time**: Estimated duration
         - **Challenges**: Common issues and solutions
         Question: {visa_query}"""
-        with st.spinner("Analyzing your visa question..."):
-            visa_answer = get_result(visa_prompt)
-            st.markdown(f"**AI Visa Advice**:\n\n{visa_answer}")
+        st.markdown("**AI Visa Advice**:")
+        visa_answer = show_result(visa_prompt, "visa_guidance")
 
     # Recent Updates
     st.subheader("🆕 2025 Visa and Job Updates")
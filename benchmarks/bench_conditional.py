@@ -0,0 +1,43 @@
+"""Replay repeated searches against the stand-in server with and without
+conditional GETs and report the bytes transferred.
+
+Usage: python benchmarks/bench_conditional.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_boards import StubBoardServer
+from utils import response_store, scrapers
+
+QUERIES = [("Data Scientist", "Remote"), ("Data Analyst", "Bangalore"), ("ML Engineer", "Pune"),
+           ("Python Developer", "Hyderabad"), ("Business Analyst", "Mumbai")]
+ROUNDS = 3
+
+
+def replay(validators):
+    with tempfile.TemporaryDirectory() as tmp, StubBoardServer(validators=validators) as server:
+        server.install()
+        response_store.store = response_store.ResponseStore(tmp)
+        scrapers._page_jobs.clear()
+        jobs = 0
+        for _ in range(ROUNDS):
+            for keyword, location in QUERIES:
+                for board in scrapers.BOARDS:
+                    jobs += len(scrapers.scrape(board, keyword, location, use_cache=False))
+        stored = sum(len(files) for _, _, files in os.walk(response_store.store.objects))
+        return server.httpd.bytes_sent, jobs, stored, response_store.store.stats()
+
+
+def main():
+    print(f"{len(QUERIES)} queries x {len(scrapers.BOARDS)} boards x {ROUNDS} rounds")
+    for name, validators in (("unconditional", False), ("conditional", True)):
+        sent, jobs, stored, counters = replay(validators)
+        print(f"{name:<14} {sent / 1024:8.1f} KiB sent  {jobs} jobs  "
+              f"{counters['not_modified']} x 304  {stored} bodies stored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Resume ingestion time for every format x size x installed backend.
+
+Usage: python benchmarks/bench_ingest.py [--sizes 2,20,200] [--repeat 5]
+
+Sizes are in pages: PDFs get that many pages from bench_pdf_text's
+generator, DOCX and TXT files get the same lines (the DOCX also has a page
+header and a skills table). Each cell is the median of ``--repeat`` runs of
+``utils.ingest.ingest`` (``pdf_text.extract_text`` for PDFs) with the
+page/character budget off, so the numbers compare backends rather than the
+budget. PDF backends that are not installed (pypdfium2, pdfminer.six) are
+listed as skipped.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+
+from bench_pdf_text import LINES_PER_PAGE, synthetic_pdf
+from utils import ingest, pdf_text
+
+BACKENDS = {"pdf": ("pypdfium2", "pypdf2", "pdfminer"), "docx": tuple(ingest.DOCX_BACKENDS), "txt": ("decode",)}
+
+
+def lines(pages):
+    return [f"Page {page + 1} line {i}: Led migration of a batch pipeline to streaming, cutting latency by {i}%"
+            for page in range(pages) for i in range(LINES_PER_PAGE)]
+
+
+def synthetic_docx(pages):
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane.doe@example.com | +44 20 7946 0000"
+    for line in lines(pages):
+        document.add_paragraph(line)
+    table = document.add_table(rows=0, cols=3)
+    for row in (("Languages", "Python, SQL", "Go"), ("Cloud", "AWS", "GCP"), ("Data", "Spark", "Airflow")):
+        cells = table.add_row().cells
+        for cell, value in zip(cells, row):
+            cell.text = value
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def synthetic_txt(pages):
+    return "\n".join(lines(pages)).encode()
+
+
+GENERATORS = {"pdf": synthetic_pdf, "docx": synthetic_docx, "txt": synthetic_txt}
+
+
+def extract(data, kind, backend):
+    if kind == "pdf":
+        # ingest() applies the page budget; compare the backends on whole documents.
+        return pdf_text.extract_text(data, max_pages=None, max_chars=None, backend=backend)
+    return ingest.ingest(data, kind, backend, max_chars=None).text
+
+
+def timed(data, kind, backend, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract(data, kind, backend)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="2,20,200")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"PDF backends installed: {', '.join(pdf_text.BACKENDS)} (default {pdf_text.DEFAULT_BACKEND})")
+    print(f"{'format':<6} {'pages':>5} {'KB':>7} {'backend':<12} {'median ms':>10} {'chars':>8} {'MB/s':>7}")
+    for kind, generate in GENERATORS.items():
+        for pages in (int(size) for size in args.sizes.split(",")):
+            data = generate(pages)
+            start = time.perf_counter()
+            assert ingest.sniff(data) == kind
+            sniff_ms = (time.perf_counter() - start) * 1000
+            for backend in BACKENDS[kind]:
+                if kind == "pdf" and backend not in pdf_text.BACKENDS:
+                    print(f"{kind:<6} {pages:>5} {len(data) / 1024:>7.1f} {backend:<12} {'skipped':>10}")
+                    continue
+                seconds, chars = timed(data, kind, backend, args.repeat)
+                print(f"{kind:<6} {pages:>5} {len(data) / 1024:>7.1f} {backend:<12} {seconds * 1000:>10.2f} "
+                      f"{chars:>8} {len(data) / seconds / 1e6:>7.2f}")
+            print(f"{kind:<6} {pages:>5} {'':>7} {'(sniff)':<12} {sniff_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
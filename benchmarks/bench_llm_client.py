@@ -0,0 +1,69 @@
+"""Per-call overhead of building a Gemini model per prompt vs the shared client,
+and how many requests a burst of identical prompts costs.
+
+Usage: python benchmarks/bench_llm_client.py
+The overhead runs use the local stand-in API with zero generation latency, so
+the numbers are pure client-side and round-trip overhead.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google.generativeai as genai
+
+from stub_llm import StubLLMServer
+from utils import llm
+
+CALLS = 200
+PROMPT = "Generate one technical interview question for a Data Scientist role."
+
+
+def per_call_model():
+    # What get_result used to do: build a new GenerativeModel for every prompt.
+    return genai.GenerativeModel("gemini-1.5-flash").generate_content(PROMPT).text
+
+
+def per_call_with_listing():
+    # The old error path additionally listed every model during the request.
+    [m.name for m in genai.list_models() if "generateContent" in m.supported_generation_methods]
+    return per_call_model()
+
+
+def shared_client():
+    return llm.get_client().generate(PROMPT).text
+
+
+def burst_of_identical_prompts(users=32):
+    # Many sessions clicking "Generate Mock Question" for the same role at once.
+    with StubLLMServer(latency=0.8) as server:
+        client = llm.GeminiClient("stub-key", transport="rest", client_options={"api_endpoint": server.base_url})
+        start = time.perf_counter()
+        with ThreadPoolExecutor(users) as pool:
+            list(pool.map(lambda _: client.generate_text(PROMPT + " (burst)"), range(users)))
+        elapsed = time.perf_counter() - start
+        print(f"{users} concurrent identical prompts: {server.calls.get('generate_content', 0)} API call(s) "
+              f"in {elapsed:.2f}s, cache {llm.response_cache.stats()}")
+
+
+def main():
+    with StubLLMServer() as server:
+        llm.get_client("stub-key", transport="rest", client_options={"api_endpoint": server.base_url})
+        print(f"{CALLS} calls each against {server.base_url}")
+        for name, fn in (("per-call model", per_call_model),
+                         ("per-call + list_models", per_call_with_listing),
+                         ("shared client", shared_client)):
+            fn()  # warm up
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                fn()
+            per_call = (time.perf_counter() - start) / CALLS
+            print(f"{name:<24} {per_call * 1000:7.3f} ms/call")
+        print(f"server calls: {server.calls}")
+    burst_of_identical_prompts()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Latency and throughput of the AI flows under concurrent load.
+
+Usage: python benchmarks/bench_llm_flows.py [--concurrency 1,8,32] [--requests 64]
+           [--latency 0.5] [--jitter 0.2] [--error-rate 0.0] [--rate-limit N]
+           [--flows resume_analysis,ats_builder,cover_letter,visa]
+
+Each flow makes the same LLM calls as its page in app.py (the Streamlit code
+itself can't run headless) against the local stand-in API, with the response
+cache off. Reports p50/p95/p99 latency per flow run and throughput at every
+concurrency level.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_llm import StubLLMServer
+from utils import llm, prompts, resume_analysis
+
+RESUME = "\n".join(
+    ["Jane Doe | jane.doe@example.com", "SKILLS:", "Python, SQL, PyTorch, Spark, Airflow, AWS"]
+    + ["EXPERIENCE:"] + [f"• Shipped forecasting model #{i}, cutting error by {i}%" for i in range(40)]
+    + ["EDUCATION:", "M.Tech, Computer Science"]
+)
+JOB = "Senior Data Scientist: Python, SQL, cloud deployment, experimentation, stakeholder communication."
+
+
+def resume_analysis_flow(client, n):
+    resume = prompts.prepare_resume(RESUME)
+    fallback = {section: f"Resume analysis section {section} #{n}: {resume}\n{JOB}"
+                for section in resume_analysis.SECTIONS}
+    for _, _, error in resume_analysis.iter_analysis(resume, f"{JOB} #{n}", fallback, client=client,
+                                                     use_cache=False):
+        if error is not None:
+            raise error
+
+
+def ats_builder_flow(client, n):
+    content = prompts.prepare_resume(RESUME)
+    llm.generate_concurrently([
+        f"Analyze this resume for a Data Scientist position (#{n}):\n{content}",
+        f"Generate a 3-sentence professional summary for a Data Scientist (#{n}) with these skills: Python, SQL",
+    ], client=client, use_cache=False)
+
+
+def cover_letter_flow(client, n):
+    "".join(client.stream_text(f"Write a cover letter (#{n}) for Data Scientist at Acme:\n{RESUME}",
+                               use_cache=False))
+
+
+def visa_flow(client, n):
+    client.generate_text(f"Act as an immigration expert. Question #{n}: How do I get a UK skilled worker visa?",
+                         use_cache=False)
+
+
+FLOWS = {
+    "resume_analysis": resume_analysis_flow,
+    "ats_builder": ats_builder_flow,
+    "cover_letter": cover_letter_flow,
+    "visa": visa_flow,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run(flow, client, concurrency, requests):
+    latencies, errors = [], 0
+
+    def one(n):
+        start = time.perf_counter()
+        try:
+            flow(client, n)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for latency in pool.map(one, range(requests)):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    wall = time.perf_counter() - start
+    return sorted(latencies), errors, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=64, help="flow runs per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--flows", default=",".join(FLOWS))
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.latency, args.chunk_delay, args.jitter, args.error_rate, args.rate_limit)
+    with server:
+        client = llm.GeminiClient("stub-key", transport="rest", client_options={"api_endpoint": server.base_url})
+        print(f"stand-in API: latency {args.latency}s + up to {args.jitter}s jitter, "
+              f"error rate {args.error_rate:.0%}, rate limit {args.rate_limit or 'none'}")
+        print(f"{'flow':<16} {'conc':>4} {'ok':>4} {'err':>4} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'flows/s':>8}")
+        for name in args.flows.split(","):
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                latencies, errors, wall = run(FLOWS[name], client, concurrency, args.requests)
+                print(f"{name:<16} {concurrency:>4} {len(latencies):>4} {errors:>4} "
+                      f"{percentile(latencies, 50):>7.3f} {percentile(latencies, 95):>7.3f} "
+                      f"{percentile(latencies, 99):>7.3f} {len(latencies) / wall:>8.2f}")
+        print(f"server calls: {server.calls}")
+        print(f"client limiter: {llm.limiter.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
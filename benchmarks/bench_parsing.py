@@ -0,0 +1,65 @@
+"""Parse time and peak memory per saved board page for each parsing backend.
+
+Usage: python benchmarks/bench_parsing.py
+
+"full" is the previous approach: a complete html.parser tree of the page.
+Peak memory comes from tracemalloc; selectolax reserves a fixed parser arena
+up front, so its peak stays roughly constant regardless of page size.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from stub_boards import BOARDS, load_fixture
+from utils.html_parsing import BACKENDS, parse_cards, select_text
+
+CARDS = {
+    "internshala": ("div", "individual_internship", "a.view_detail_button"),
+    "indeed": ("a", "tapItem", "h2"),
+    "naukri": ("article", "jobTuple", "a.title"),
+    "timesjobs": ("li", "job-bx", "h2"),
+}
+REPEAT = 50
+
+
+def parse_full(content, tag, css_class, title):
+    soup = BeautifulSoup(content, "html.parser")
+    return [card.select_one(title).text.strip() for card in soup.select(f"{tag}.{css_class}")]
+
+
+def parse_with(backend):
+    def run(content, tag, css_class, title):
+        return [select_text(card, title) for card in parse_cards(content, tag, css_class, backend)]
+    return run
+
+
+def measure(fn, content, spec):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(content, *spec)
+    elapsed = (time.perf_counter() - start) / REPEAT
+
+    tracemalloc.start()
+    fn(content, *spec)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    runners = [("full", parse_full)] + [(backend, parse_with(backend)) for backend in BACKENDS]
+    print(f"{'board':<12} {'backend':<12} {'ms/page':>8} {'peak KiB':>9}")
+    for board in BOARDS:
+        content = load_fixture(board)
+        for name, fn in runners:
+            elapsed, peak = measure(fn, content, CARDS[board])
+            print(f"{board:<12} {name:<12} {elapsed * 1000:8.2f} {peak / 1024:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
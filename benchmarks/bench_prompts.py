@@ -0,0 +1,51 @@
+"""Input tokens spent on resume context before and after prompt preparation.
+
+Usage: python benchmarks/bench_prompts.py
+Builds synthetic 1-, 3- and 8-page resumes the way PyPDF2 extracts them
+(layout whitespace, a repeated header and a page number on every page) and
+reports the estimated tokens per prompt and the preparation time.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import prompts
+
+HEADER = "Jane Doe    |    jane.doe@example.com    |    +91 98765 43210"
+SECTIONS = {
+    "SUMMARY": "Data scientist with {n} years building    forecasting and NLP systems in production.",
+    "SKILLS": "Python, SQL, PyTorch, Spark, Airflow, AWS, Docker, statistics, A/B testing ({n})",
+    "EXPERIENCE": "  •  Led migration of batch model #{n} to streaming, cutting latency by {n}0%   ",
+    "PROJECTS": "  •  Open-source project {n}: time-series anomaly detection toolkit",
+    "EDUCATION": "M.Tech, Computer Science, IIT ({n})",
+}
+
+
+def synthetic_resume(pages):
+    out = []
+    for page in range(1, pages + 1):
+        out.append(HEADER)
+        for heading, line in SECTIONS.items():
+            out.append(f"{heading}:" if page == 1 else "")
+            out.extend(line.format(n=page * 10 + i) for i in range(8))
+        out.append(f"Page {page} of {pages}")
+    return "\n".join(out)
+
+
+def main():
+    print(f"{'pages':>5} {'raw tokens':>11} {'compressed':>11} {'budgeted':>9} {'prep ms':>8}")
+    for pages in (1, 3, 8):
+        text = synthetic_resume(pages)
+        start = time.perf_counter()
+        compressed = prompts.compress_resume(text)
+        budgeted = prompts.fit_to_budget(compressed, prompts.DEFAULT_RESUME_BUDGET)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{pages:>5} {prompts.estimate_tokens(text):>11,} {prompts.estimate_tokens(compressed):>11,} "
+              f"{prompts.estimate_tokens(budgeted):>9,} {elapsed:>8.2f}")
+    print(f"three resume prompts per analysis, budget {prompts.DEFAULT_RESUME_BUDGET} tokens each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Time to structure a resume into sections, skills and contact details.
+
+Usage: python benchmarks/bench_resume_structure.py [--repeat 200]
+Runs ``utils.resume_structure.structure`` on bench_prompts' synthetic 1-, 3-
+and 8-page resumes (PDF-style whitespace, repeated headers and page numbers)
+and reports the median time per resume and what was found.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_prompts import synthetic_resume
+from utils import resume_structure
+
+PAGE_COUNTS = (1, 3, 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'pages':>5} {'chars':>7} {'median ms':>10} {'p95 ms':>7} {'sections':>8} {'skills':>6}")
+    for pages in PAGE_COUNTS:
+        text = synthetic_resume(pages)
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = resume_structure.structure(text)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"{pages:>5} {len(text):>7} {statistics.median(times) * 1000:>10.3f} "
+              f"{times[int(len(times) * 0.95) - 1] * 1000:>7.3f} {len(result['sections']):>8} "
+              f"{len(result['skills']):>6}")
+    print(f"skills found: {', '.join(result['skills'])}")
+    print(f"contact: {result['contact']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Sequential vs concurrent board scraping against the local stand-in server.
+
+Usage: python benchmarks/bench_scrapers.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_boards import StubBoardServer
+from utils import scrapers, transport
+
+LATENCY = {"internshala": 0.4, "indeed": 0.8, "naukri": 0.6, "timesjobs": 1.2}
+KEYWORD, LOCATION = "Data Scientist", "Remote"
+
+
+def run_sequential():
+    jobs = []
+    for board in scrapers.BOARDS:
+        jobs.extend(scrapers.scrape(board, KEYWORD, LOCATION, use_cache=False))
+    return jobs
+
+
+def run_concurrent():
+    return scrapers.scrape_all(KEYWORD, LOCATION, use_cache=False, dedupe=False)
+
+
+def timed(fn, repeat=3):
+    best, jobs = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        jobs = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, len(jobs)
+
+
+def main():
+    with StubBoardServer(LATENCY) as server:
+        server.install()
+        print(f"board latencies: {LATENCY}")
+        print(f"sum of latencies: {sum(LATENCY.values()):.2f}s, slowest: {max(LATENCY.values()):.2f}s")
+        for name, fn in (("sequential", run_sequential), ("scrape_all", run_concurrent)):
+            elapsed, count = timed(fn)
+            print(f"{name:<12} {elapsed:6.2f}s  {count} jobs")
+
+        # A board slower than its deadline is dropped; the rest still come back.
+        start = time.perf_counter()
+        jobs = scrapers.scrape_all(KEYWORD, LOCATION, board_timeouts={"timesjobs": 0.5}, use_cache=False, dedupe=False)
+        print(f"{'partial':<12} {time.perf_counter() - start:6.2f}s  {len(jobs)} jobs (timesjobs deadline 0.5s)")
+
+        # Warm the result cache, then time repeat queries that differ only in case/spacing.
+        scrapers.scrape_all(KEYWORD, LOCATION)
+        start = time.perf_counter()
+        for _ in range(1000):
+            scrapers.scrape_all("  data   SCIENTIST ", "remote")
+        per_call = (time.perf_counter() - start) / 1000
+        print(f"{'cached':<12} {per_call * 1e6:6.0f}us per scrape_all  {scrapers.job_cache.stats()}")
+
+        counters = transport.stats.snapshot()
+        print(f"transport: {counters['requests']} requests, {counters['pool_hits']} pool hits, "
+              f"{counters['pool_misses']} misses, avg connect {counters['avg_connect_time'] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Local HTTP stand-in for the job boards, serving the saved pages in fixtures/.
+
+Each board is mounted under its own prefix (``/indeed/...``) with a configurable
+response delay, so scrapers can be exercised without touching the real sites.
+"""
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+BOARDS = ("internshala", "indeed", "naukri", "timesjobs")
+LAST_MODIFIED = "Mon, 06 Oct 2025 08:00:00 GMT"
+
+
+def load_fixture(board):
+    with open(os.path.join(FIXTURES_DIR, f"{board}.html"), "rb") as f:
+        return f.read()
+
+
+class BoardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        board = self.path.lstrip("/").split("/", 1)[0]
+        if board not in self.server.pages:
+            self.send_error(404)
+            return
+        time.sleep(self.server.latency.get(board, 0))
+        status = self.server.status.get(board, 200)
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.server.pages[board]
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.server.validators and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that give up on a slow board just close the socket.
+        pass
+
+
+class StubBoardServer:
+    """Context manager that serves the fixtures on an ephemeral localhost port."""
+
+    def __init__(self, latency=None, status=None, validators=True):
+        self.httpd = _QuietServer(("127.0.0.1", 0), BoardHandler)
+        self.httpd.pages = {board: load_fixture(board) for board in BOARDS}
+        self.httpd.latency = dict(latency or {})
+        # board -> HTTP status to answer with instead of the page, e.g. 429
+        self.httpd.status = dict(status or {})
+        # Send ETag/Last-Modified and answer matching If-None-Match with 304.
+        self.httpd.validators = validators
+        self.httpd.bytes_sent = 0
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self):
+        """Board -> base URL mapping, applied to each ``utils.boards.BOARDS`` entry by ``install()``."""
+        return {board: f"{self.base_url}/{board}" for board in BOARDS}
+
+    def install(self):
+        """Point the board adapters at this server and drop their rate limits."""
+        from utils.boards import BOARDS as ADAPTERS
+        for board, url in self.base_urls().items():
+            ADAPTERS[board]["base_url"] = url
+            ADAPTERS[board]["rate_limit"] = None
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
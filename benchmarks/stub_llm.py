@@ -0,0 +1,208 @@
+"""Local stand-in for the Gemini REST API (v1beta).
+
+Serves ``models.list``, ``models.get``, ``generateContent`` and
+``streamGenerateContent`` with a configurable response delay (plus jitter
+and, for streams, a per-chunk delay), an injected error rate and a
+requests-per-second limit answered with 429s, so the SDK can be pointed at it
+with ``transport="rest"`` and ``client_options={"api_endpoint": server.base_url}``.
+
+Run it standalone and point the app at it with GEMINI_API_ENDPOINT:
+    python benchmarks/stub_llm.py --port 8765 --latency 0.8 --error-rate 0.02 --rate-limit 20
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ratelimit import Throttled, TokenBucket
+
+MODELS = ("gemini-1.5-flash", "gemini-1.5-pro")
+# Returned when the request asks for application/json output.
+JSON_ANSWER = {
+    "score": 7,
+    "matching_skills": ["Python", "SQL"],
+    "missing_skills": ["Kubernetes"],
+    "improvements": ["Quantify the impact of each project", "Add cloud deployment keywords"],
+    "interview_questions": ["Explain a model you shipped", "Describe a conflict you resolved", "How would you scale this?"],
+}
+
+
+def model_json(name):
+    return {
+        "name": f"models/{name}",
+        "baseModelId": name,
+        "version": "001",
+        "displayName": name,
+        "inputTokenLimit": 1048576,
+        "outputTokenLimit": 8192,
+        "supportedGenerationMethods": ["generateContent", "countTokens"],
+    }
+
+
+def completion_json(text):
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+        "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text.split()), "totalTokenCount": 0},
+    }
+
+
+class LLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, name):
+        with self.server.lock:
+            self.server.calls[name] = self.server.calls.get(name, 0) + 1
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/v1beta/models":
+            self._count("list_models")
+            self._send_json({"models": [model_json(name) for name in MODELS]})
+            return
+        match = re.fullmatch(r"/v1beta/models/([\w.-]+)", path)
+        if match and match.group(1) in MODELS:
+            self._count("get_model")
+            self._send_json(model_json(match.group(1)))
+            return
+        self._send_json({"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?", 1)[0]
+        match = re.fullmatch(r"/v1beta/models/([\w.-]+):(generateContent|streamGenerateContent)", path)
+        if not match or match.group(1) not in MODELS:
+            self._send_json({"error": {"code": 404, "message": "model not found", "status": "NOT_FOUND"}}, 404)
+            return
+        server = self.server
+        if server.bucket is not None:
+            try:
+                server.bucket.acquire(max_wait=0)
+            except Throttled:
+                self._count("rate_limited")
+                self._send_error(429, "RESOURCE_EXHAUSTED", "Quota exceeded", {"Retry-After": "1"})
+                return
+        if server.error_rate and random.random() < server.error_rate:
+            self._count("errors")
+            time.sleep(server.latency)
+            self._send_error(500, "INTERNAL", "Injected stub failure")
+            return
+        prompt = " ".join(part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", []))
+        if request.get("generationConfig", {}).get("responseMimeType") == "application/json":
+            answer = json.dumps(JSON_ANSWER)
+        else:
+            answer = f"Stub answer to: {prompt.strip()[:60]}"
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        if match.group(2) == "generateContent":
+            self._count("generate_content")
+            self._send_json(completion_json(answer))
+            return
+        self._count("stream_generate_content")
+        self._stream_json([completion_json(word + " ") for word in answer.split()])
+
+    def _send_error(self, code, status, message, headers=None):
+        body = json.dumps({"error": {"code": code, "message": message, "status": status}}).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_json(self, chunks):
+        # The REST transport reads a JSON array incrementally, one element per chunk.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, payload in enumerate(chunks):
+            if i:
+                time.sleep(self.server.chunk_delay)
+            data = ("[" if i == 0 else ",") + json.dumps(payload)
+            self._write_chunk(data.encode())
+        self._write_chunk(b"]" if chunks else b"[]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubLLMServer:
+    """Context manager that serves the stand-in API on an ephemeral localhost port."""
+
+    def __init__(self, latency=0.0, chunk_delay=0.0, jitter=0.0, error_rate=0.0, rate_limit=None, port=0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), LLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.chunk_delay = chunk_delay
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.bucket = TokenBucket(rate_limit, capacity=max(1, int(rate_limit))) if rate_limit else None
+        self.httpd.calls = {}
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def calls(self):
+        return dict(self.httpd.calls)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before the first byte")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random latency, seconds")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with a 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests/second before 429s")
+    args = parser.parse_args()
+    server = StubLLMServer(args.latency, args.chunk_delay, args.jitter, args.error_rate, args.rate_limit, args.port)
+    with server:
+        print(f"Stand-in Gemini API on {server.base_url} (Ctrl+C to stop)")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+        print(f"calls: {server.calls}")
+
+
+if __name__ == "__main__":
+    main()
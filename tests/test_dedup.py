@@ -0,0 +1,29 @@
+from utils.dedup import dedupe
+from utils.jobs import JobPosting
+
+
+def test_placeholder_title_and_company_are_matched_by_link_only():
+    jobs = [
+        JobPosting("No Title", "Unknown", "Indeed", "https://in.indeed.com/viewjob?jk=1"),
+        JobPosting("No Title", "Unknown", "Indeed", "https://in.indeed.com/viewjob?jk=2"),
+        JobPosting("No Title", "Unknown", "Indeed", "https://in.indeed.com/viewjob?jk=2&from=serp"),
+    ]
+    assert [job.link for job in dedupe(jobs)] == [jobs[0].link, jobs[1].link]
+
+
+def test_same_title_and_company_across_boards_still_merge():
+    jobs = [
+        JobPosting("Sr. Data Scientist", "Acme Pvt Ltd", "Naukri", "https://naukri.com/a"),
+        JobPosting("Senior Data Scientist", "Acme", "TimesJobs", "https://timesjobs.com/b"),
+    ]
+    assert len(dedupe(jobs)) == 1
+
+
+def test_same_board_postings_with_different_links_are_kept():
+    jobs = [
+        JobPosting("Python Developer", "TCS", "Naukri", "https://www.naukri.com/python-developer-tcs-bangalore-1"),
+        JobPosting("Python Developer", "TCS", "Naukri", "https://www.naukri.com/python-developer-tcs-pune-2"),
+        JobPosting("Python Developer", "TCS", "Naukri", "https://www.naukri.com/python-developer-tcs-chennai-3"),
+        JobPosting("Python Developer", "TCS Ltd", "Indeed", "https://in.indeed.com/viewjob?jk=4"),
+    ]
+    assert [job.link for job in dedupe(jobs)] == [job.link for job in jobs[:3]]
@@ -0,0 +1,27 @@
+import pytest
+
+from utils.jobs import parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Docstring examples
+    ("CAD 110,000", (110000.0, "CAD")),
+    ("£35,000", (35000.0, "GBP")),
+    ("5-9 Lacs PA", (500000.0, None)),
+    ("₹12 LPA", (1200000.0, "INR")),
+    # Indian "lakhs per annum" variants
+    ("10-15 LPA", (1000000.0, None)),
+    ("12 L PA", (1200000.0, None)),
+    ("8.5 lpa", (850000.0, None)),
+    ("Rs. 6 Lakhs", (600000.0, "INR")),
+    ("3-5 lakhs", (300000.0, None)),
+    # Thousands and plain figures
+    ("$120k", (120000.0, "USD")),
+    ("€45K - €55K", (45000.0, "EUR")),
+    ("USD 95,000 per year", (95000.0, "USD")),
+    ("Not disclosed", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
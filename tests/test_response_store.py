@@ -0,0 +1,42 @@
+import os
+import time
+
+from requests import Response
+
+from utils import response_store
+
+
+def make_response(body, headers=None):
+    r = Response()
+    r.status_code = 200
+    r._content = body
+    r.headers.update(headers or {})
+    return r
+
+
+def stored_bodies(store):
+    return sum(len(files) for _, _, files in os.walk(store.objects))
+
+
+def test_bodies_without_validators_are_hashed_not_stored(tmp_path):
+    store = response_store.ResponseStore(str(tmp_path))
+    digest = store.remember("https://example.com/a", make_response(b"<html>a</html>"))
+    assert digest and stored_bodies(store) == 0
+    assert store.validators("https://example.com/a") is None
+
+    store.remember("https://example.com/b", make_response(b"<html>b</html>", {"ETag": '"b"'}))
+    assert stored_bodies(store) == 1
+    assert store.conditional_headers("https://example.com/b") == {"If-None-Match": '"b"'}
+
+
+def test_maintenance_drops_old_rows_and_their_bodies(tmp_path, monkeypatch):
+    store = response_store.ResponseStore(str(tmp_path), max_entries=2)
+    monkeypatch.setattr(store, "MAINTENANCE_INTERVAL", 5)
+    monkeypatch.setattr(store, "GRACE_PERIOD", 0)
+    for i in range(5):
+        store.remember(f"https://example.com/{i}", make_response(f"page {i}".encode(), {"ETag": f'"{i}"'}))
+        time.sleep(0.01)
+    assert stored_bodies(store) == 2
+    assert store.validators("https://example.com/0") is None
+    assert store.validators("https://example.com/4") is not None
+
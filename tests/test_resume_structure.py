@@ -0,0 +1,21 @@
+import pytest
+
+from utils.resume_structure import extract_skills, match_skills, structure
+
+
+@pytest.mark.parametrize("phrase", [
+    "Drive R&D initiatives", "A Go-to person for the team", "Brief C-level and C-suite stakeholders",
+    "Vitamin C supplements", "Work on R & D",
+])
+def test_ordinary_words_are_not_skills(phrase):
+    assert extract_skills(phrase) == []
+
+
+def test_job_description_wording_does_not_lower_the_match():
+    result = match_skills(["Python", "SQL"], "Drive R&D initiatives... C-level stakeholders. Python and SQL required.")
+    assert result == {"score": 10.0, "matched": ["Python", "SQL"], "missing": []}
+
+
+def test_ambiguous_skills_still_count_where_they_are_skills():
+    assert extract_skills("Built services in Go and Spark") == ["Go", "Spark"]
+    assert structure("Jane Doe\nSkills: C, R, Go\nExperience\nLed R&D work")["skills"] == ["C", "R", "Go"]
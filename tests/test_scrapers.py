@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from requests import HTTPError, Response
+
+from utils import ratelimit, scrapers
+from utils.jobs import JobPosting
+
+
+@pytest.fixture
+def fresh_guards(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(ratelimit, "_breakers", {})
+
+
+def test_throttled_fetch_does_not_strand_half_open_trial(fresh_guards):
+    url = scrapers.page_url("indeed", "python", "remote")
+    bucket, breaker = ratelimit.guard(url, scrapers.BOARDS["indeed"].get("rate_limit"))
+    # Breaker has cooled down and is ready for its half-open trial ...
+    breaker.state = "open"
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+    # ... but the host is still paused by a long Retry-After.
+    bucket.pause(60)
+
+    with pytest.raises(ratelimit.Throttled):
+        scrapers.fetch_page("indeed", url, timeout=0.1)
+
+    assert breaker.allow(), "the half-open trial must still be available after Throttled"
+
+
+@pytest.mark.parametrize("status", [401, 403, 451])
+def test_block_responses_trip_the_breaker(fresh_guards, monkeypatch, status):
+    response = Response()
+    response.status_code = status
+    response._content = b"Access denied"
+    monkeypatch.setattr(scrapers.transport, "conditional_get", lambda *args, **kwargs: (response, b"", None))
+    url = scrapers.page_url("naukri", "python", "pune")
+    bucket, breaker = ratelimit.guard(url, scrapers.BOARDS["naukri"].get("rate_limit"))
+    monkeypatch.setattr(bucket, "rate", None)
+    monkeypatch.setattr(breaker, "failure_threshold", 2)
+
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            scrapers.fetch_page("naukri", url, timeout=5)
+
+    assert breaker.is_open()
+    assert not scrapers.board_available("naukri")
+
+
+def fake_pages(monkeypatch, pages):
+    requested = []
+
+    def fetch_page(board, url, timeout=None):
+        requested.append(url)
+        return pages[min(len(requested), len(pages)) - 1]
+
+    monkeypatch.setattr(scrapers, "fetch_page", fetch_page)
+    return requested
+
+
+def collect_async(*args, **kwargs):
+    async def run():
+        return [job async for job in scrapers.aiter_jobs(*args, **kwargs)]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("limit, expected, fetched", [(None, 4, 3), (3, 3, 2), (1, 1, 1)])
+def test_sync_and_async_iteration_stop_at_the_same_point(monkeypatch, limit, expected, fetched):
+    page = lambda *links: [JobPosting("Data Analyst", "Acme", "Naukri", link) for link in links]
+    # The board repeats its last page past the end.
+    pages = [page("a", "b"), page("c", "d"), page("c", "d")]
+    for collect in (lambda: list(scrapers.iter_jobs("naukri", "data", "pune", limit=limit)),
+                    lambda: collect_async("naukri", "data", "pune", limit=limit)):
+        requested = fake_pages(monkeypatch, pages)
+        assert [job.link for job in collect()] == ["a", "b", "c", "d"][:expected]
+        assert len(requested) == fetched
+
+
+def test_cancelled_iteration_requests_no_more_pages(monkeypatch):
+    cancel = threading.Event()
+    cancel.set()
+    requested = fake_pages(monkeypatch, [[]])
+    assert list(scrapers.iter_jobs("naukri", "data", "pune", cancel=cancel)) == []
+    assert collect_async("naukri", "data", "pune", cancel=cancel) == []
+    assert requested == []
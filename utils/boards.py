@@ -0,0 +1,89 @@
+"""Job board adapters, declared as data and executed by utils.scrapers.
+
+Each board entry describes:
+    platform     display name stored in every job's "Platform"
+    base_url     scheme + host; relative links are resolved against it
+    url          first results page; placeholders {base}, {keyword}, {location},
+                 {keyword_slug}, {location_slug} (spaces -> dashes)
+    pagination   {"url": template for page >= 2 (adds {page} and {offset}),
+                  "page_size": cards per page}
+    card         (tag, css class) of one job card
+    fields       output key -> (css selector or None for the card itself,
+                 attribute or None for text, default or None if required)
+    rate_limit   max requests per second to the board
+    ttl          seconds a cached result stays fresh
+
+Adding a board is a matter of adding an entry here (or calling register_board).
+"""
+
+BOARDS = {
+    "internshala": {
+        "platform": "Internshala",
+        "base_url": "https://internshala.com",
+        "url": "{base}/internships/keywords-{keyword_slug}/",
+        "pagination": {"url": "{base}/internships/keywords-{keyword_slug}/page-{page}/", "page_size": 40},
+        "card": ("div", "individual_internship"),
+        "fields": {
+            "Title": ("a.view_detail_button", None, None),
+            "Company": ("div.company_name", None, None),
+            "Link": ("a.view_detail_button", "href", None),
+        },
+        "rate_limit": 1.0,
+        "ttl": 3600,
+    },
+    "indeed": {
+        "platform": "Indeed",
+        "base_url": "https://www.indeed.com",
+        "url": "{base}/jobs?q={keyword}&l={location}",
+        "pagination": {"url": "{base}/jobs?q={keyword}&l={location}&start={offset}", "page_size": 10},
+        "card": ("a", "tapItem"),
+        "fields": {
+            "Title": ("h2", None, "No Title"),
+            "Company": ("span.companyName", None, "Unknown"),
+            "Link": (None, "href", None),
+        },
+        "rate_limit": 0.5,
+        "ttl": 900,
+    },
+    "naukri": {
+        "platform": "Naukri",
+        "base_url": "https://www.naukri.com",
+        "url": "{base}/{keyword_slug}-jobs-in-{location_slug}",
+        "pagination": {"url": "{base}/{keyword_slug}-jobs-in-{location_slug}-{page}", "page_size": 20},
+        "card": ("article", "jobTuple"),
+        "fields": {
+            "Title": ("a.title", None, None),
+            "Company": ("a.subTitle", None, None),
+            "Link": ("a.title", "href", None),
+        },
+        "rate_limit": 0.5,
+        "ttl": 1800,
+    },
+    "timesjobs": {
+        "platform": "TimesJobs",
+        "base_url": "https://www.timesjobs.com",
+        "url": "{base}/candidate/job-search.html?searchType=personalizedSearch&txtKeywords={keyword}&txtLocation={location}",
+        "pagination": {
+            "url": "{base}/candidate/job-search.html?searchType=personalizedSearch&txtKeywords={keyword}&txtLocation={location}&sequence={page}&startPage=1",
+            "page_size": 25,
+        },
+        "card": ("li", "job-bx"),
+        "fields": {
+            "Title": ("h2", None, None),
+            "Company": ("h3.joblist-comp-name", None, None),
+            "Link": ("a", "href", None),
+        },
+        "rate_limit": 1.0,
+        "ttl": 1800,
+    },
+}
+
+REQUIRED_KEYS = ("platform", "base_url", "url", "card", "fields")
+
+
+def register_board(name, spec):
+    """Add or replace a board adapter after checking it has the required keys."""
+    missing = [key for key in REQUIRED_KEYS if key not in spec]
+    if missing:
+        raise ValueError(f"Board '{name}' is missing: {', '.join(missing)}")
+    BOARDS[name] = spec
@@ -0,0 +1,288 @@
+"""TTL + LRU result cache with an optional SQLite tier shared across processes.
+
+Values must be JSON-serializable when the disk tier is enabled (or converted
+with the ``encode``/``decode`` hooks). Entries past
+their TTL but inside the stale window are served immediately while a
+background refresh runs (stale-while-revalidate). Concurrent misses for the
+same key share a single fetch (single-flight).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class LRUCache:
+    """Bounded in-memory store of ``key -> (value, stored_at)``."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at=None):
+        with self._lock:
+            self._data[key] = (value, stored_at if stored_at is not None else time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteStore:
+    """On-disk tier; safe to share between worker processes (WAL mode)."""
+
+    def __init__(self, path, table="cache"):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at=None):
+        with self._conn() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at if stored_at is not None else time.time()),
+            )
+
+    def delete(self, key):
+        with self._conn() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def values(self):
+        return [json.loads(row[0]) for row in self._conn().execute(f"SELECT value FROM {self.table}")]
+
+    def purge(self, older_than):
+        """Drop rows stored more than ``older_than`` seconds ago."""
+        with self._conn() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (time.time() - older_than,))
+
+    def trim(self, max_rows):
+        """Keep only the ``max_rows`` most recently stored rows."""
+        with self._conn() as conn:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT ?)",
+                (max_rows,),
+            )
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one.
+
+    The first caller for a key runs ``fn``; callers arriving while it is
+    still running wait for it and get the same value or exception.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return call.result()
+        try:
+            value = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class ResultCache:
+    """Two-tier cache with per-call TTL and stale-while-revalidate.
+
+    The disk tier is purged of expired rows and trimmed to ``disk_maxsize``
+    rows every ``MAINTENANCE_INTERVAL`` writes.
+    """
+
+    MAINTENANCE_INTERVAL = 100
+
+    def __init__(self, maxsize=256, ttl=900, stale_ttl=3600, path=None, table="cache", encode=None, decode=None,
+                 disk_maxsize=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.memory = LRUCache(maxsize)
+        self.disk = SQLiteStore(path, table) if path else None
+        self.disk_maxsize = disk_maxsize
+        self._writes = 0
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        self.hits = self.stale_hits = self.misses = 0
+        self.inflight = SingleFlight()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+    def _lookup(self, key):
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                entry = (self.decode(entry[0]), entry[1])
+                self.memory.set(key, *entry)
+        return entry
+
+    def get(self, key, ttl=None):
+        """Return the fresh cached value for ``key`` or None."""
+        entry = self._lookup(key)
+        if entry is None or time.time() - entry[1] > (ttl or self.ttl):
+            return None
+        return entry[0]
+
+    def peek(self, key):
+        """Return the cached value for ``key`` however old it is, or None."""
+        entry = self._lookup(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value):
+        stored_at = time.time()
+        self.memory.set(key, value, stored_at)
+        if self.disk is not None:
+            self.disk.set(key, self.encode(value), stored_at)
+            self._writes += 1
+            if self._writes % self.MAINTENANCE_INTERVAL == 0:
+                self._maintain()
+
+    def _maintain(self):
+        try:
+            self.disk.purge(self.ttl + self.stale_ttl)
+            if self.disk_maxsize:
+                self.disk.trim(self.disk_maxsize)
+        except sqlite3.Error as e:
+            print("Cache maintenance error:", e)
+
+    def invalidate(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def get_or_fetch(self, key, fetch, ttl=None, store_if=bool):
+        """Return the cached value for ``key``, calling ``fetch()`` on a miss.
+
+        Values rejected by ``store_if`` (empty results by default) are returned
+        but not cached, so a failed scrape is retried on the next call.
+        Callers missing on a key that is already being fetched wait for that
+        fetch instead of starting their own.
+        """
+        return self.fetch_with_status(key, fetch, ttl, store_if)[0]
+
+    def fetch_with_status(self, key, fetch, ttl=None, store_if=bool):
+        """``get_or_fetch`` that also says how the value was served:
+        "hit", "stale", "miss" (this call fetched) or "coalesced"."""
+        ttl = ttl or self.ttl
+        entry = self._lookup(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age <= ttl:
+                self.hits += 1
+                return value, "hit"
+            if age <= ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh(key, fetch, store_if)
+                return value, "stale"
+
+        fetched = False
+
+        def load():
+            nonlocal fetched
+            fetched = True
+            self.misses += 1
+            value = fetch()
+            if store_if is None or store_if(value):
+                self.set(key, value)
+            return value
+
+        value = self.inflight.do(key, load)
+        return value, "miss" if fetched else "coalesced"
+
+    def _refresh(self, key, fetch, store_if):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                value = fetch()
+                if store_if is None or store_if(value):
+                    self.set(key, value)
+            except Exception as e:
+                print("Cache refresh error:", e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.inflight.coalesced,
+            "size": len(self.memory),
+        }
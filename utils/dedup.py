@@ -0,0 +1,158 @@
+"""Cross-board job deduplication.
+
+Two postings are the same job when their canonical links match, when their
+normalized (title, company) match exactly, or when their title SimHashes are
+within ``max_distance`` bits for the same normalized company. Postings whose
+title or company is missing or a board placeholder ("No Title", "Unknown")
+are only matched by link, and so are two postings from the same board with
+different links (one company hiring for the same role in several cities).
+Near-duplicate
+candidates come from banded SimHash buckets, so a batch is processed in
+near-linear time instead of comparing every pair.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "from", "vjs", "src", "sid", "ref", "refid", "trk", "trackingid", "tk", "gclid", "fbclid",
+    "xid", "searchtype", "sequence", "startpage", "ad", "advn", "sjdu", "acatk", "pub",
+}
+ABBREVIATIONS = {
+    "sr": "senior", "jr": "junior", "engg": "engineer", "eng": "engineer", "mgr": "manager",
+    "dev": "developer", "ml": "machine learning", "ai": "artificial intelligence", "assoc": "associate",
+}
+NOISE_WORDS = {"urgent", "hiring", "opening", "immediate", "joiner", "joiners", "wfh", "job", "vacancy", "for"}
+# Normalized values boards fill in when a field is missing (see the defaults in utils.boards).
+PLACEHOLDERS = {"", "no title", "untitled", "unknown", "n a", "na", "not disclosed", "confidential"}
+COMPANY_SUFFIXES = {"pvt", "private", "ltd", "limited", "inc", "llc", "llp", "corp", "corporation", "co", "plc", "gmbh"}
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_TRACKING_PATH_RE = re.compile(r"__utm_.*$")
+SIMHASH_BITS = 64
+BANDS = 4
+
+
+def canonical_link(url):
+    """Lower-case scheme/host, drop fragments and tracking parameters."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")]
+    path = _TRACKING_PATH_RE.sub("", parts.path).rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+def normalize_title(title):
+    words = []
+    for word in _WORD_RE.findall((title or "").lower()):
+        if word in NOISE_WORDS:
+            continue
+        words.append(ABBREVIATIONS.get(word, word))
+    return " ".join(words)
+
+
+def normalize_company(company):
+    words = [word for word in _WORD_RE.findall((company or "").lower()) if word not in COMPANY_SUFFIXES]
+    return " ".join(words)
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=65536)
+def simhash(text):
+    """64-bit SimHash of the words and word bigrams in ``text``."""
+    words = text.split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = _token_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _bands(fingerprint):
+    width = SIMHASH_BITS // BANDS
+    mask = (1 << width) - 1
+    return [(band, fingerprint >> (band * width) & mask) for band in range(BANDS)]
+
+
+class DedupIndex:
+    """Incremental index; ``add(job)`` returns True the first time a job is seen.
+
+    ``groups`` maps the index of each kept job (in insertion order) to the
+    postings merged into it, so callers can show "also on Naukri, TimesJobs".
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        self.kept = []
+        self.groups = {}
+        self._links = {}
+        self._keys = {}
+        self._buckets = {}
+        self._fingerprints = []
+        self._canonical = []
+
+    def _distinct_listing(self, candidate, job, link):
+        # The same board lists each posting once, so a different link there is a different job.
+        return bool(link) and self.kept[candidate].platform == job.platform and self._canonical[candidate] != link
+
+    def _match(self, job):
+        link = canonical_link(job.link)
+        if link and link in self._links:
+            return self._links[link], link, None, None
+        company = normalize_company(job.company)
+        title = normalize_title(job.title)
+        if title in PLACEHOLDERS or company in PLACEHOLDERS:
+            return None, link, None, None
+        key = hashlib.sha1(f"{title}|{company}".encode()).hexdigest()
+        for candidate in self._keys.get(key, ()):
+            if not self._distinct_listing(candidate, job, link):
+                return candidate, link, key, None
+        fingerprint = simhash(title)
+        for band in _bands(fingerprint):
+            for candidate in self._buckets.get((company, band), ()):
+                if (bin(fingerprint ^ self._fingerprints[candidate]).count("1") <= self.max_distance
+                        and not self._distinct_listing(candidate, job, link)):
+                    return candidate, link, key, fingerprint
+        return None, link, key, fingerprint
+
+    def add(self, job):
+        match, link, key, fingerprint = self._match(job)
+        if match is not None:
+            self.groups[match].append(job)
+            if link:
+                self._links.setdefault(link, match)
+            return False
+
+        position = len(self.kept)
+        self.kept.append(job)
+        self.groups[position] = [job]
+        self._fingerprints.append(fingerprint)
+        self._canonical.append(link)
+        if link:
+            self._links[link] = position
+        if key is None:
+            return True
+        self._keys.setdefault(key, []).append(position)
+        company = normalize_company(job.company)
+        for band in _bands(fingerprint):
+            self._buckets.setdefault((company, band), []).append(position)
+        return True
+
+
+def dedupe(jobs, max_distance=3):
+    """Return ``jobs`` with cross-board duplicates removed, keeping first occurrences."""
+    index = DedupIndex(max_distance)
+    for job in jobs:
+        index.add(job)
+    return index.kept
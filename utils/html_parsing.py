@@ -0,0 +1,83 @@
+"""Card-scoped HTML parsing for the board scrapers.
+
+Only the job card containers are parsed (``SoupStrainer``), and field
+selectors are compiled once. Backends, fastest first: selectolax, lxml and
+html.parser; the first one installed is the default.
+"""
+import re
+from functools import lru_cache
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+BACKENDS = [name for name, available in (
+    ("selectolax", HTMLParser is not None),
+    ("lxml", HAS_LXML),
+    ("html.parser", True),
+) if available]
+DEFAULT_BACKEND = BACKENDS[0]
+
+
+@lru_cache(maxsize=None)
+def _card_strainer(tag, css_class):
+    # The class attribute is still a raw string while straining, so match the
+    # class as a whole word instead of comparing the full value.
+    pattern = re.compile(rf"(?:^|\s){re.escape(css_class)}(?:\s|$)")
+    return SoupStrainer(tag, attrs={"class": pattern})
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Compile a CSS selector once for reuse on every card."""
+    return soupsieve.compile(selector)
+
+
+def parse_cards(content, tag, css_class, backend=None):
+    """Return the ``tag.css_class`` card elements of a results page.
+
+    Everything outside the cards is skipped while parsing, so the rest of the
+    page (navigation, scripts, footers) never becomes a tree.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "selectolax":
+        return HTMLParser(content).css(f"{tag}.{css_class}")
+    soup = BeautifulSoup(content, backend, parse_only=_card_strainer(tag, css_class))
+    return soup.find_all(tag, class_=css_class)
+
+
+def select_node(card, selector=None):
+    """First node matching ``selector`` inside ``card`` (the card itself if None)."""
+    if selector is None:
+        return card
+    if isinstance(card, Tag):
+        return compile_selector(selector).select_one(card)
+    return card.css_first(selector)
+
+
+def select_text(card, selector=None):
+    node = select_node(card, selector)
+    if node is None:
+        return None
+    text = node.get_text() if isinstance(node, Tag) else node.text()
+    return text.strip()
+
+
+def select_attr(card, selector, name):
+    node = select_node(card, selector)
+    if node is None:
+        return None
+    return node.get(name) if isinstance(node, Tag) else node.attributes.get(name)
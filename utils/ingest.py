@@ -0,0 +1,229 @@
+"""One entry point for resume uploads: PDF, DOCX and plain text.
+
+``ingest`` decides the format from the file's magic bytes, not its name, so a
+renamed or extension-less upload still parses, and a file that is none of
+the three is refused before any parser touches it. PDFs go through the
+fastest installed backend in ``utils.pdf_text``. DOCX text is read in
+document order with tables as `` | ``-separated rows, and page headers and
+footers (where contact details often live) come first. The default DOCX
+backend walks ``word/document.xml`` with ElementTree; python-docx gives the
+same text but runs an XPath query per paragraph, which gets slow on long
+documents (see benchmarks/bench_ingest.py).
+"""
+import codecs
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import docx
+from docx.table import Table
+
+from utils import parsing, pdf_text
+
+SNIFF_BYTES = 4096
+
+
+class UnsupportedFormat(parsing.ParseError):
+    def __init__(self, message="Unsupported file format; please upload a PDF, DOCX or TXT resume"):
+        super().__init__(message)
+
+
+class Document:
+    """Text extracted from one upload, plus how it was read."""
+
+    __slots__ = ("kind", "backend", "text", "tables", "truncated")
+
+    def __init__(self, kind, backend, text, tables=(), truncated=False):
+        self.kind = kind
+        self.backend = backend
+        self.text = text
+        self.tables = [list(row) for row in tables]
+        self.truncated = truncated
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"Document({self.kind!r}, backend={self.backend!r}, chars={len(self.text)})"
+
+
+def sniff(data):
+    """``"pdf"``, ``"docx"`` or ``"txt"`` from the leading bytes of ``data``, else None."""
+    head = bytes(data[:SNIFF_BYTES])
+    # The PDF spec tolerates junk before the header, and some generators emit it.
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                archive.getinfo("word/document.xml")
+        except (zipfile.BadZipFile, KeyError):
+            return None
+        return "docx"
+    if head.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "txt"
+    if b"\x00" in head or head.startswith(b"{\\rtf"):
+        return None
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still UTF-8.
+        if e.start < len(head) - 3:
+            return _looks_like_text(head)
+    return "txt"
+
+
+def _looks_like_text(head):
+    printable = sum(byte >= 32 or byte in b"\t\n\r\f" for byte in head)
+    return "txt" if printable / max(len(head), 1) > 0.95 else None
+
+
+def _decode(data):
+    if data.startswith(codecs.BOM_UTF8):
+        return data[len(codecs.BOM_UTF8):].decode("utf-8", errors="replace")
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode("utf-16", errors="replace")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def _table_rows(table):
+    rows = []
+    for row in table.rows:
+        cells = []
+        previous = None
+        for cell in row.cells:
+            # Merged cells come back once per grid column they span.
+            if previous is not None and cell._tc is previous:
+                continue
+            previous = cell._tc
+            cells.append(" ".join(cell.text.split()))
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def _docx_blocks(container, tables):
+    lines = []
+    for block in container.iter_inner_content():
+        if isinstance(block, Table):
+            rows = _table_rows(block)
+            tables.extend(rows)
+            lines.extend(" | ".join(cell for cell in row if cell) for row in rows)
+        else:
+            text = block.text
+            if text.strip():
+                lines.append(text)
+    return lines
+
+
+def _read_python_docx(data):
+    document = docx.Document(io.BytesIO(data))
+    tables = []
+    margins = []
+    seen = set()
+    for section in document.sections:
+        for part in (section.header, section.footer):
+            if part.is_linked_to_previous:
+                continue
+            for line in _docx_blocks(part, tables):
+                if line not in seen:
+                    seen.add(line)
+                    margins.append(line)
+    return "\n".join(margins + _docx_blocks(document, tables)), tables
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MARGIN_PART_RE = re.compile(r"word/(header|footer)(\d*)\.xml$")
+
+
+def _xml_paragraph(paragraph):
+    parts = []
+    for run in paragraph.iter(_W + "r"):
+        for child in run:
+            if child.tag == _W + "t":
+                parts.append(child.text or "")
+            elif child.tag == _W + "tab":
+                parts.append("\t")
+            elif child.tag in (_W + "br", _W + "cr"):
+                parts.append("\n")
+    return "".join(parts)
+
+
+def _xml_table_rows(table):
+    rows = []
+    for row in table.findall(_W + "tr"):
+        cells = [" ".join(" ".join(_xml_paragraph(p) for p in cell.iter(_W + "p")).split())
+                 for cell in row.findall(_W + "tc")]
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def _xml_blocks(container, tables, lines):
+    for block in container:
+        if block.tag == _W + "p":
+            text = _xml_paragraph(block)
+            if text.strip():
+                lines.append(text)
+        elif block.tag == _W + "tbl":
+            rows = _xml_table_rows(block)
+            tables.extend(rows)
+            lines.extend(" | ".join(cell for cell in row if cell) for row in rows)
+        elif block.tag == _W + "sdt":
+            # Content controls, which some templates wrap whole sections in.
+            content = block.find(_W + "sdtContent")
+            if content is not None:
+                _xml_blocks(content, tables, lines)
+    return lines
+
+
+def _margin_order(name):
+    kind, number = _MARGIN_PART_RE.match(name).groups()
+    return kind != "header", int(number or 0)
+
+
+def _read_docx_xml(data):
+    tables = []
+    margins = []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for name in sorted((n for n in archive.namelist() if _MARGIN_PART_RE.match(n)), key=_margin_order):
+            for line in _xml_blocks(ElementTree.fromstring(archive.read(name)), tables, []):
+                if line not in margins:
+                    margins.append(line)
+        body = ElementTree.fromstring(archive.read("word/document.xml")).find(_W + "body")
+    lines = _xml_blocks(body if body is not None else (), tables, [])
+    return "\n".join(margins + lines), tables
+
+
+DOCX_BACKENDS = {"docx-xml": _read_docx_xml, "python-docx": _read_python_docx}
+
+
+def ingest(data, kind=None, backend=None, max_chars=pdf_text.MAX_CHARS):
+    """Extract a ``Document`` from upload bytes.
+
+    ``kind`` skips sniffing when the caller already knows the format;
+    ``backend`` picks a PDF backend (see ``pdf_text.BACKENDS``) or a DOCX
+    one (``DOCX_BACKENDS``). Raises ``UnsupportedFormat`` for anything that
+    is not PDF, DOCX or text.
+    """
+    kind = kind or sniff(data)
+    tables = ()
+    if kind == "pdf":
+        backend = backend or pdf_text.DEFAULT_BACKEND
+        text = pdf_text.extract_text(data, max_chars=max_chars, backend=backend)
+    elif kind == "docx":
+        backend = backend or "docx-xml"
+        text, tables = DOCX_BACKENDS[backend](data)
+    elif kind == "txt":
+        backend = "decode"
+        text = _decode(data)
+    else:
+        raise UnsupportedFormat()
+    truncated = max_chars is not None and len(text) >= max_chars
+    if truncated:
+        text = text[:max_chars]
+    return Document(kind, backend, text, tables, truncated)
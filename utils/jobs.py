@@ -0,0 +1,117 @@
+"""Shared job posting record used by the scrapers, the visa job search and exports."""
+import re
+import sys
+
+CURRENCY_SYMBOLS = {"$": "USD", "£": "GBP", "€": "EUR", "₹": "INR", "Rs": "INR", "Rs.": "INR"}
+# Units are case-insensitive and may be followed by "PA" (per annum): "12 LPA", "5 Lacs PA", "10 L pa".
+_UNIT = r"(?P<unit>(?i:k|lacs?|lakhs?|l))(?:\s?(?i:pa))?"
+_SALARY_RE = re.compile(r"(?P<currency>[A-Z]{3}|Rs\.?|[$£€₹])?\s*(?P<amount>\d[\d,]*(?:\.\d+)?)\s*(?:" + _UNIT + r")?\b")
+_TRAILING_UNIT_RE = re.compile(r"\s*-\s*[\d,.]+\s*" + _UNIT + r"\b")
+_UNITS = {"k": 1_000, "l": 100_000, "lac": 100_000, "lacs": 100_000, "lakh": 100_000, "lakhs": 100_000}
+
+
+def parse_salary(text):
+    """Return (amount, currency) for the first figure in a salary string.
+
+    "CAD 110,000" -> (110000.0, "CAD"), "£35,000" -> (35000.0, "GBP"),
+    "5-9 Lacs PA" -> (500000.0, None), "₹12 LPA" -> (1200000.0, "INR");
+    (None, None) when there is no figure.
+    """
+    match = _SALARY_RE.search(text or "")
+    if not match:
+        return None, None
+    amount = float(match.group("amount").replace(",", ""))
+    unit = match.group("unit")
+    if unit is None:
+        # "5-9 Lacs": the unit trails the range, so look past the second figure.
+        trailing = _TRAILING_UNIT_RE.match(text, match.end())
+        unit = trailing.group("unit") if trailing else None
+    if unit:
+        amount *= _UNITS[unit.lower()]
+    currency = match.group("currency")
+    return amount, CURRENCY_SYMBOLS.get(currency, currency)
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+class JobPosting:
+    """One job listing.
+
+    Uses ``__slots__`` and interns the low-cardinality strings (platform,
+    company, location, currency, visa, job type) so large result sets stay
+    small. Supports ``job["Title"]`` / ``job["title"]`` lookups so code written
+    against the old dict records keeps working.
+    """
+
+    __slots__ = ("title", "company", "platform", "link", "location", "salary",
+                 "salary_amount", "currency", "visa", "job_type")
+
+    def __init__(self, title, company, platform="", link="", location="", salary="",
+                 visa="", job_type=""):
+        self.title = title
+        self.company = _intern(company)
+        self.platform = _intern(platform)
+        self.link = link
+        self.location = _intern(location)
+        self.salary = salary
+        self.salary_amount, currency = parse_salary(salary)
+        self.currency = _intern(currency)
+        self.visa = _intern(visa)
+        self.job_type = _intern(job_type)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from either schema: scraper keys ("Title", "Link", ...) or
+        listing keys ("title", "salary", "visa", "type", ...)."""
+        data = {key.lower(): value for key, value in data.items()}
+        return cls(
+            title=data.get("title", ""),
+            company=data.get("company", ""),
+            platform=data.get("platform", ""),
+            link=data.get("link", ""),
+            location=data.get("location", ""),
+            salary=data.get("salary", ""),
+            visa=data.get("visa", ""),
+            job_type=data.get("type") or data.get("job_type", ""),
+        )
+
+    def to_dict(self):
+        """Export record; empty fields are left out."""
+        record = {
+            "Title": self.title,
+            "Company": self.company,
+            "Platform": self.platform,
+            "Link": self.link,
+            "Location": self.location,
+            "Salary": self.salary,
+            "Visa": self.visa,
+            "Type": self.job_type,
+        }
+        return {key: value for key, value in record.items() if value}
+
+    def __getitem__(self, key):
+        attr = {"type": "job_type"}.get(key.lower(), key.lower())
+        if attr not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if not isinstance(other, JobPosting):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"JobPosting({self.title!r}, {self.company!r}, platform={self.platform!r})"
+
+
+def to_records(jobs):
+    """Plain dicts for exports (CSV, Excel, JSON)."""
+    return [job.to_dict() for job in jobs]
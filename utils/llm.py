@@ -0,0 +1,474 @@
+"""Process-wide Gemini client shared by every AI feature.
+
+The SDK is configured once, the model fallback list is resolved once against
+``list_models`` at start-up, and ``GenerativeModel`` instances (and the SDK's
+underlying client channel) are reused for every call instead of being rebuilt
+per prompt.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import google.generativeai as genai
+import requests
+
+from utils import ratelimit
+from utils.cache import ResultCache
+from utils.ratelimit import INTERACTIVE
+from utils.telemetry import LLMMetrics
+
+try:
+    from google.api_core.exceptions import NotFound
+except ImportError:
+    NotFound = LookupError
+
+PREFERRED_MODELS = ("gemini-1.5-flash", "gemini-1.5-flash-latest", "gemini-1.5-pro", "gemini-pro")
+
+# Responses keyed by (model, normalized prompt, generation params). Set
+# LLM_CACHE_DB to a file path to persist them across restarts and workers.
+response_cache = ResultCache(
+    maxsize=1024, ttl=24 * 3600, stale_ttl=0, path=os.environ.get("LLM_CACHE_DB"), table="llm_responses",
+    disk_maxsize=20000,
+)
+
+
+def normalize_prompt(prompt):
+    """Strip indentation and collapse runs of spaces so reformatted prompts share a key."""
+    lines = (" ".join(line.split()) for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def prompt_key(model_name, prompt, params=None):
+    payload = json.dumps([model_name, normalize_prompt(prompt), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class TokenUsage:
+    """Token counts reported by the API, in total and for the most recent calls."""
+
+    def __init__(self, history=200):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.recent = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record(self, response, prompt_chars=0):
+        """Add the response's token counts; returns them as a dict (None if not reported)."""
+        meta = getattr(response, "usage_metadata", None)
+        if meta is None:
+            return None
+        entry = {
+            "prompt_tokens": meta.prompt_token_count,
+            "output_tokens": meta.candidates_token_count,
+            "prompt_chars": prompt_chars,
+            "at": time.time(),
+        }
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += entry["prompt_tokens"]
+            self.output_tokens += entry["output_tokens"]
+            self.recent.append(entry)
+        return entry
+
+    def last(self):
+        with self._lock:
+            return dict(self.recent[-1]) if self.recent else None
+
+    def snapshot(self):
+        with self._lock:
+            return {"calls": self.calls, "prompt_tokens": self.prompt_tokens, "output_tokens": self.output_tokens}
+
+
+usage = TokenUsage()
+# Per-feature latency/TTFT/token/cache/error records; LLM_METRICS_LOG appends
+# each call to a JSON lines file.
+metrics = LLMMetrics(log_path=os.environ.get("LLM_METRICS_LOG"))
+
+
+class LLMError(Exception):
+    """A failed LLM call. ``user_message`` is safe to show in the UI."""
+
+    user_message = "The AI service could not process this request. Please try again."
+    retryable = False
+
+
+class RateLimited(LLMError):
+    """429 / quota exhausted, or no concurrency slot freed up in time."""
+
+    user_message = "The AI service is busy right now. Please try again in a minute."
+    retryable = True
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMTimeout(LLMError):
+    user_message = "The AI service took too long to respond. Please try again."
+    retryable = True
+
+
+class ServiceError(LLMError):
+    """5xx responses and connection failures."""
+
+    user_message = "The AI service is temporarily unavailable. Please try again shortly."
+    retryable = True
+
+
+class BlockedResponse(LLMError):
+    """The prompt or answer was blocked, or the answer came back empty."""
+
+    user_message = "The AI could not answer this request. Try rephrasing it."
+
+
+class ModelUnavailable(LLMError):
+    """None of the preferred models can serve generateContent."""
+
+    user_message = "No Gemini model is currently available. Please try again later."
+
+
+def classify(exc):
+    """Map an SDK/transport exception to the matching ``LLMError`` subclass."""
+    if isinstance(exc, LLMError):
+        return exc
+    code = getattr(exc, "code", None)
+    if code == 429 or isinstance(exc, ratelimit.Throttled):
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        retry_after = ratelimit.parse_retry_after(headers.get("Retry-After"), default=None)
+        error = RateLimited(str(exc), retry_after)
+    elif code in (408, 504) or isinstance(exc, (TimeoutError, requests.Timeout)):
+        error = LLMTimeout(str(exc))
+    elif (isinstance(code, int) and code >= 500) or isinstance(exc, requests.ConnectionError):
+        error = ServiceError(str(exc))
+    elif isinstance(exc, (ValueError, genai.types.BlockedPromptException, genai.types.StopCandidateException)):
+        error = BlockedResponse(str(exc))
+    else:
+        error = LLMError(f"{type(exc).__name__}: {exc}")
+    error.__cause__ = exc
+    return error
+
+
+# Shared by every backend call. Starts low and grows while calls succeed;
+# LLM_MAX_CONCURRENCY caps it.
+limiter = ratelimit.AdaptiveLimiter(initial=4, maximum=int(os.environ.get("LLM_MAX_CONCURRENCY", 16)))
+MAX_RETRIES = 3
+SLOT_TIMEOUT = 60
+
+
+def call_with_retries(fn, priority=INTERACTIVE, retries=MAX_RETRIES, hold=False):
+    """Run ``fn`` in a ``limiter`` slot, retrying transient failures with jittered backoff.
+
+    Raises an ``LLMError``; throttled calls also shrink the concurrency limit.
+    With ``hold`` the slot is still held when ``fn`` succeeds and the caller
+    must ``limiter.release`` it, e.g. once a stream has been read.
+    """
+    for attempt in range(retries + 1):
+        try:
+            limiter.acquire(priority, timeout=SLOT_TIMEOUT)
+        except ratelimit.Throttled as e:
+            raise RateLimited(str(e)) from e
+        try:
+            result = fn()
+        except Exception as e:
+            error = classify(e)
+            limiter.release("throttled" if isinstance(error, RateLimited) else "error")
+            if not error.retryable or attempt == retries:
+                raise error
+            delay = ratelimit.backoff(attempt)
+            if getattr(error, "retry_after", None):
+                delay = max(delay, min(error.retry_after, 30))
+            time.sleep(delay)
+            continue
+        if not hold:
+            limiter.release("ok")
+        return result
+
+
+class LLMBackend:
+    """Interface behind ``get_result`` and the other AI features.
+
+    A backend sets ``model_name`` and implements ``generate(prompt, **kwargs)``
+    returning an object with ``.text`` and ``.usage_metadata``; with
+    ``stream=True`` it returns an iterable of such chunks instead. Caching,
+    streaming and usage accounting are shared here.
+    """
+
+    model_name = ""
+
+    def generate(self, prompt, **kwargs):
+        raise NotImplementedError
+
+    def generate_text(self, prompt, use_cache=True, ttl=None, priority=INTERACTIVE, feature="other", **kwargs):
+        """Return the response text, served from ``response_cache`` when possible.
+
+        A prompt already in flight (from any session in this process) is not
+        sent again; the caller waits for that request's answer. Pass
+        ``use_cache=False`` for prompts that must produce a fresh answer each
+        time, and ``priority=ratelimit.BACKGROUND`` for work nobody is waiting on.
+        Failures raise an ``LLMError`` and are never cached. Each call is
+        recorded in ``metrics`` under ``feature``.
+        """
+        tokens = {}
+
+        def call():
+            response = self.generate(prompt, **kwargs)
+            tokens.update(usage.record(response, len(normalize_prompt(prompt))) or {})
+            return response.text
+
+        fetch = lambda: call_with_retries(call, priority)
+        start = time.perf_counter()
+        cache, error = "bypass", ""
+        try:
+            if not use_cache:
+                return fetch()
+            key = prompt_key(self.model_name, prompt, kwargs)
+            text, cache = response_cache.fetch_with_status(key, fetch, ttl=ttl)
+            return text
+        except LLMError as e:
+            error = type(e).__name__
+            raise
+        finally:
+            metrics.record(feature, time.perf_counter() - start, prompt_tokens=tokens.get("prompt_tokens"),
+                           output_tokens=tokens.get("output_tokens"), cache=cache, error=error,
+                           model=self.model_name)
+
+    def stream_text(self, prompt, use_cache=True, ttl=None, priority=INTERACTIVE, feature="other", **kwargs):
+        """Yield the response text in chunks as the model produces them.
+
+        A cached response is yielded as a single chunk; a stream that runs to
+        completion is stored under the same key ``generate_text`` uses. Only
+        opening the stream is retried; a failure mid-stream raises an ``LLMError``.
+        The ``limiter`` slot is held until the stream is exhausted or closed.
+        Time to first chunk is recorded as the call's TTFT.
+        """
+        key = prompt_key(self.model_name, prompt, kwargs)
+        start = time.perf_counter()
+        ttft, tokens, cache, error = None, {}, "bypass", ""
+        try:
+            if use_cache:
+                cached = response_cache.get(key, ttl=ttl)
+                if cached is not None:
+                    cache = "hit"
+                    yield cached
+                    return
+                cache = "miss"
+            parts = []
+            # The slot stays held until the stream is read or closed, so the
+            # concurrency limit covers the whole response, not just opening it.
+            response = call_with_retries(lambda: self.generate(prompt, stream=True, **kwargs), priority, hold=True)
+            outcome = "ok"
+            try:
+                for chunk in response:
+                    text = chunk.text
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    parts.append(text)
+                    yield text
+            except Exception as e:
+                failure = classify(e)
+                outcome = "throttled" if isinstance(failure, RateLimited) else "error"
+                raise failure
+            finally:
+                limiter.release(outcome)
+            tokens = usage.record(response, len(normalize_prompt(prompt))) or {}
+            if use_cache and parts:
+                response_cache.set(key, "".join(parts))
+        except LLMError as e:
+            error = type(e).__name__
+            raise
+        finally:
+            metrics.record(feature, time.perf_counter() - start, ttft, tokens.get("prompt_tokens"),
+                           tokens.get("output_tokens"), cache, error, self.model_name)
+
+    def health_check(self, max_age=300):
+        return True
+
+
+class GeminiClient(LLMBackend):
+    def __init__(self, api_key, preferred=PREFERRED_MODELS, transport=None, client_options=None):
+        endpoint = os.environ.get("GEMINI_API_ENDPOINT")
+        if endpoint and client_options is None:
+            # e.g. the local stand-in server used by the benchmarks
+            transport, client_options = transport or "rest", {"api_endpoint": endpoint}
+        genai.configure(api_key=api_key, transport=transport, client_options=client_options)
+        self.available = self._list_models()
+        # An empty listing (e.g. no list permission) means we just try in order.
+        self.candidates = [name for name in preferred if not self.available or name in self.available]
+        if not self.candidates:
+            raise ModelUnavailable(
+                f"None of {', '.join(preferred)} are available. "
+                f"Available models: {', '.join(sorted(self.available))}"
+            )
+        self.model_name = self.candidates[0]
+        self.healthy = True
+        self.last_health_check = 0.0
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _list_models():
+        try:
+            return {
+                m.name.split("/")[-1] for m in genai.list_models()
+                if "generateContent" in m.supported_generation_methods
+            }
+        except Exception as e:
+            print("Could not list Gemini models:", e)
+            return set()
+
+    def model(self, name=None):
+        """Return the cached GenerativeModel for ``name`` (the active model by default)."""
+        name = name or self.model_name
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = genai.GenerativeModel(name)
+        return model
+
+    def generate(self, prompt, **kwargs):
+        """Call generate_content, moving down the fallback list if a model has gone away."""
+        if isinstance(prompt, str):
+            # Template indentation and blank lines are pure input-token cost.
+            prompt = normalize_prompt(prompt)
+        start = self.candidates.index(self.model_name)
+        for name in self.candidates[start:]:
+            try:
+                response = self.model(name).generate_content(prompt, **kwargs)
+            except NotFound:
+                print(f"Gemini model {name} not found, falling back")
+                continue
+            self.model_name = name
+            return response
+        raise ModelUnavailable(f"All fallback models failed: {', '.join(self.candidates)}")
+
+    def health_check(self, max_age=300):
+        """Cheap metadata lookup of the active model, cached for ``max_age`` seconds.
+
+        A model that has gone away is replaced by the next available
+        fallback, as ``generate`` would; False means no model answered.
+        """
+        now = time.monotonic()
+        if now - self.last_health_check < max_age:
+            return self.healthy
+        self.healthy = False
+        start = self.candidates.index(self.model_name)
+        for name in self.candidates[start:]:
+            try:
+                genai.get_model(f"models/{name}", request_options={"timeout": 5})
+            except NotFound:
+                print(f"Gemini model {name} not found, falling back")
+                continue
+            except Exception as e:
+                print("Gemini health check failed:", e)
+                break
+            self.model_name = name
+            self.healthy = True
+            break
+        self.last_health_check = now
+        return self.healthy
+
+
+BACKENDS = {"gemini": GeminiClient}
+
+
+def register_backend(name, factory):
+    """Make ``factory(api_key, **kwargs)`` selectable as ``LLM_BACKEND=name``."""
+    BACKENDS[name] = factory
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(api_key=None, backend=None, **kwargs):
+    """Return the process-wide client, creating it on first call (needs ``api_key``).
+
+    The backend is ``backend``, else the LLM_BACKEND environment variable,
+    else "gemini".
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if api_key is None:
+                    raise RuntimeError("get_client() needs an api_key the first time it is called")
+                name = backend or os.environ.get("LLM_BACKEND", "gemini")
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown LLM backend {name!r}; choose from {', '.join(BACKENDS)}")
+                _client = BACKENDS[name](api_key, **kwargs)
+    return _client
+
+
+def set_client(client):
+    """Install an already-built ``LLMBackend`` as the process-wide client."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def stats():
+    """Cache (including single-flight ``coalesced`` count), limiter and token usage counters."""
+    return {"cache": response_cache.stats(), "limiter": limiter.snapshot(), "usage": usage.snapshot()}
+
+
+def stream(prompt, **kwargs):
+    """Generator over response chunks from the shared client (see ``LLMBackend.stream_text``)."""
+    return get_client().stream_text(prompt, **kwargs)
+
+
+# Shared by all sessions; each batch is further capped by ``max_concurrency``.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+MAX_CONCURRENCY = 4
+
+
+def iter_generate_concurrently(prompts, max_concurrency=MAX_CONCURRENCY, client=None, features=None, **kwargs):
+    """Run independent prompts in parallel and yield ``(index, text, error)`` as each finishes.
+
+    At most ``max_concurrency`` calls of the batch are in flight at once;
+    ``error`` is the raised exception (and ``text`` None) for a failed call.
+    ``features`` optionally gives each prompt's metrics tag.
+    """
+    client = client or get_client()
+    queued = iter(enumerate(prompts))
+    pending = {}
+
+    def submit_next():
+        for index, prompt in queued:
+            if features is not None:
+                kwargs["feature"] = features[index]
+            pending[_executor.submit(client.generate_text, prompt, **kwargs)] = index
+            return
+
+    for _ in range(max_concurrency):
+        submit_next()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            error = future.exception()
+            yield index, None if error else future.result(), error
+            submit_next()
+
+
+def generate_concurrently(prompts, max_concurrency=MAX_CONCURRENCY, client=None, features=None, **kwargs):
+    """Like ``iter_generate_concurrently`` but returns the texts in prompt order (raising the first error)."""
+    results = [None] * len(prompts)
+    for index, text, error in iter_generate_concurrently(prompts, max_concurrency, client, features, **kwargs):
+        if error is not None:
+            raise error
+        results[index] = text
+    return results
+
+
+def reset_client():
+    """Drop the shared client, e.g. after rotating the API key."""
+    global _client
+    with _client_lock:
+        _client = None
@@ -0,0 +1,205 @@
+"""Document parsing offloaded to a bounded pool of worker processes.
+
+PyPDF2 is pure Python and CPU-bound: parsing in the Streamlit script thread
+blocks that session and, through the GIL, slows every other session in the
+process. ``ParsingService.parse`` hands the bytes to an idle worker process
+and waits for the result, so parses run on separate cores.
+
+Each worker runs under an address-space limit (``memory_mb``) and a CPU-time
+limit per document (``cpu_seconds``). A document that runs past ``timeout``
+or is cancelled has its worker killed and replaced; the caller gets a
+``ParseTimeout``/``ParseCancelled`` instead of a hung page.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the wall-clock timeout applies
+    resource = None
+
+DEFAULT_TIMEOUT = 30
+CPU_SECONDS = 20
+MEMORY_MB = 1024
+
+
+class ParseError(Exception):
+    """The document could not be parsed."""
+
+
+class ParseTimeout(ParseError):
+    pass
+
+
+class ParseCancelled(ParseError):
+    pass
+
+
+class _CPUTimeExceeded(Exception):
+    pass
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CPUTimeExceeded()
+
+
+def _cpu_used():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _worker_main(conn, cpu_seconds, memory_mb):
+    from utils.resume_cache import parse_resume_bytes
+
+    if resource is not None:
+        if memory_mb:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+    while True:
+        try:
+            kind, data = conn.recv()
+        except EOFError:
+            return
+        if resource is not None and cpu_seconds:
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            resource.setrlimit(resource.RLIMIT_CPU, (int(_cpu_used()) + cpu_seconds, hard))
+        try:
+            conn.send(("ok", parse_resume_bytes(data, kind)))
+        except _CPUTimeExceeded:
+            conn.send(("error", f"Document needed more than {cpu_seconds}s of CPU time to parse"))
+        except MemoryError:
+            conn.send(("error", f"Document needed more than {memory_mb} MB of memory to parse"))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            if resource is not None and cpu_seconds:
+                hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+                resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        # Fork workers from a clean server process rather than from the
+        # multi-threaded Streamlit process, with the parser already imported.
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["utils.resume_cache"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    def __init__(self, ctx, cpu_seconds, memory_mb):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, cpu_seconds, memory_mb), daemon=True,
+                                   name="resume-parser")
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ParsingService:
+    """Bounded pool of parser processes, started lazily and reused across documents."""
+
+    def __init__(self, max_workers=None, timeout=DEFAULT_TIMEOUT, cpu_seconds=CPU_SECONDS, memory_mb=MEMORY_MB):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.parsed = self.failed = self.timeouts = self.cancelled = 0
+        self._ctx = None
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+
+    def _checkout(self):
+        try:
+            worker = self._idle.get_nowait()
+            if worker.process.is_alive():
+                return worker
+            worker.kill()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._ctx is None:
+                self._ctx = _context()
+        return _Worker(self._ctx, self.cpu_seconds, self.memory_mb)
+
+    def parse(self, data, kind="pdf", timeout=None, cancel=None):
+        """Parse ``data`` in a worker process and return the ``resume_cache.parse_resume_bytes`` dict.
+
+        Waits for a free worker first. Raises ``ParseTimeout`` after
+        ``timeout`` seconds in total, ``ParseCancelled`` once the ``cancel``
+        event is set, and ``ParseError`` for documents that fail or exceed
+        their CPU/memory limits.
+        """
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        if not self._slots.acquire(timeout=timeout):
+            self.timeouts += 1
+            raise ParseTimeout(f"No parser free within {timeout}s; the server is busy, please try again")
+        worker = None
+        try:
+            worker = self._checkout()
+            worker.conn.send((kind, data))
+            while True:
+                remaining = deadline - time.monotonic()
+                if cancel is not None and cancel.is_set():
+                    self.cancelled += 1
+                    raise ParseCancelled("Parsing was cancelled")
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise ParseTimeout(f"Parsing took longer than {timeout}s; the file may be too large or damaged")
+                ready = wait([worker.conn, worker.process.sentinel], timeout=min(remaining, 0.1))
+                try:
+                    if worker.conn in ready:
+                        status, payload = worker.conn.recv()
+                        break
+                    if worker.process.sentinel in ready:
+                        raise EOFError
+                except (EOFError, OSError):
+                    self.failed += 1
+                    raise ParseError("The parser stopped unexpectedly; the file may be too large or damaged")
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+            self._slots.release()
+            raise
+        self._idle.put(worker)
+        self._slots.release()
+        if status == "error":
+            self.failed += 1
+            raise ParseError(payload)
+        self.parsed += 1
+        return payload
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "idle": self._idle.qsize(),
+            "parsed": self.parsed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+        }
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+
+# PARSE_WORKERS=0 parses in the calling thread instead (e.g. where processes can't be started).
+_workers = int(os.environ.get("PARSE_WORKERS", "-1"))
+service = None if _workers == 0 else ParsingService(max_workers=_workers if _workers > 0 else None)
@@ -0,0 +1,113 @@
+"""Streaming PDF text extraction shared by the app and the resume parser.
+
+Pages are read one at a time and their text is collected in a list and
+joined once, instead of growing one string with ``+=``. Extraction stops as
+soon as the page or character budget is reached, and each page (and the
+objects it resolved) is dropped from the reader once its text is out, so a
+long upload is never held in memory all at once.
+
+Backends, fastest first: pypdfium2 (PDFium, C++), PyPDF2 and pdfminer.six;
+the first one installed is the default and PDF_BACKEND overrides it.
+pdfminer reproduces layout better but is the slowest of the three, so it is
+only picked when PyPDF2 is missing or it is asked for by name.
+"""
+import io
+import os
+
+from PyPDF2 import PdfReader
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+except ImportError:
+    extract_pages = None
+
+# A resume longer than this is almost certainly not a resume; the prompt
+# budget in utils.prompts trims far below MAX_CHARS anyway.
+MAX_PAGES = 50
+MAX_CHARS = 100_000
+
+
+def _release(reader, index):
+    # PyPDF2 keeps every flattened page and every resolved object for the
+    # reader's lifetime; forget them once a page has been read.
+    try:
+        reader.flattened_pages[index] = None
+        reader.resolved_objects.clear()
+    except (AttributeError, IndexError, TypeError):
+        pass
+
+
+def _pypdf2_pages(source, max_pages):
+    reader = PdfReader(source)
+    count = len(reader.pages)
+    if max_pages is not None:
+        count = min(count, max_pages)
+    for index in range(count):
+        text = reader.pages[index].extract_text() or ""
+        _release(reader, index)
+        yield text
+
+
+def _pypdfium2_pages(source, max_pages):
+    if hasattr(source, "read"):
+        source = source.read()
+    document = pypdfium2.PdfDocument(source)
+    try:
+        count = len(document)
+        if max_pages is not None:
+            count = min(count, max_pages)
+        for index in range(count):
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        document.close()
+
+
+def _pdfminer_pages(source, max_pages):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    for layout in extract_pages(source, maxpages=max_pages or 0):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+_PAGE_READERS = {"pypdfium2": _pypdfium2_pages, "pypdf2": _pypdf2_pages, "pdfminer": _pdfminer_pages}
+BACKENDS = [name for name, available in (
+    ("pypdfium2", pypdfium2 is not None),
+    ("pypdf2", True),
+    ("pdfminer", extract_pages is not None),
+) if available]
+DEFAULT_BACKEND = os.environ.get("PDF_BACKEND") if os.environ.get("PDF_BACKEND") in BACKENDS else BACKENDS[0]
+
+
+def iter_page_text(source, max_pages=MAX_PAGES, backend=None):
+    """Yield the text of each page of ``source`` (path, bytes or file object), up to ``max_pages``."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"PDF backend {backend!r} is not installed (available: {', '.join(BACKENDS)})")
+    if isinstance(source, (bytes, bytearray)) and backend == "pypdf2":
+        source = io.BytesIO(source)
+    return _PAGE_READERS[backend](source, max_pages)
+
+
+def extract_text(source, max_pages=MAX_PAGES, max_chars=MAX_CHARS, separator="\n", backend=None):
+    """Text of ``source`` with pages joined by ``separator``, cut at ``max_chars``."""
+    parts = []
+    size = 0
+    for text in iter_page_text(source, max_pages, backend):
+        if max_chars is not None and size + len(text) >= max_chars:
+            parts.append(text[:max_chars - size])
+            break
+        parts.append(text)
+        size += len(text) + len(separator)
+    return separator.join(parts)
@@ -0,0 +1,103 @@
+"""Prompt assembly: token estimates, resume compression and section-aware budgets.
+
+Resume text from PDFs carries a lot of dead weight (layout whitespace, page
+numbers, headers and footers repeated on every page). ``prepare_resume``
+strips that once and trims what is left to a per-prompt token budget,
+cutting the least important sections first so skills and experience survive.
+"""
+import re
+from functools import lru_cache
+
+# Gemini averages roughly four characters of English text per token.
+CHARS_PER_TOKEN = 4
+DEFAULT_RESUME_BUDGET = 1500
+
+# Most important first; anything unrecognised ranks after these.
+SECTION_PRIORITY = ("header", "contact", "skills", "experience", "summary", "projects", "certifications",
+                    "education", "achievements", "languages")
+SECTION_ALIASES = {
+    "objective": "summary", "profile": "summary", "employment": "experience", "work": "experience",
+    "certification": "certifications", "awards": "achievements",
+}
+_HEADING_RE = re.compile(
+    r"^(?:professional|work|technical|key|core|relevant|academic|personal|career|licenses?\s*(?:&|and))?\s*"
+    r"(summary|objective|profile|skills|experience|employment|education|projects|certifications?|languages|"
+    r"achievements|awards|contact)(?:\s+(?:history|summary|experience|information|details))?\s*:?$",
+    re.IGNORECASE,
+)
+_PAGE_RE = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate; close enough for budgeting without an API call."""
+    return -(-len(text or "") // CHARS_PER_TOKEN)
+
+
+def compress_resume(text):
+    """Collapse whitespace and drop page numbers and repeated lines (headers/footers)."""
+    lines = []
+    seen = set()
+    for raw in (text or "").splitlines():
+        line = " ".join(raw.split())
+        if not line or _PAGE_RE.match(line):
+            continue
+        key = line.lower()
+        if key in seen and len(line) > 3:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def section_name(line):
+    """Canonical section name if ``line`` is a resume heading, else None."""
+    match = _HEADING_RE.match(line.strip())
+    if not match:
+        return None
+    name = match.group(1).lower()
+    return SECTION_ALIASES.get(name, name)
+
+
+def split_sections(text):
+    """Split into ``[(name, lines)]``; lines before the first heading form "header"."""
+    sections = [("header", [])]
+    for line in text.splitlines():
+        name = section_name(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def _rank(name):
+    return SECTION_PRIORITY.index(name) if name in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+
+def fit_to_budget(text, budget):
+    """Trim ``text`` to about ``budget`` tokens, shortening low-priority sections first.
+
+    Sections lose lines from the end, each keeping its heading and first
+    line for as long as possible; the original order is preserved.
+    """
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    sections = split_sections(text)
+    size = sum(len(line) + 1 for _, lines in sections for line in lines)
+    by_priority = sorted(sections, key=lambda section: _rank(section[0]), reverse=True)
+    # First pass keeps each heading plus its first line; the second keeps headings only.
+    for keep in (2, 1):
+        for _, lines in by_priority:
+            while len(lines) > keep and size > limit:
+                size -= len(lines.pop()) + 1
+    result = "\n".join(line for _, lines in sections for line in lines)
+    if len(result) > limit:
+        result = result[:limit].rsplit("\n", 1)[0]
+    return result
+
+
+@lru_cache(maxsize=64)
+def prepare_resume(text, budget=DEFAULT_RESUME_BUDGET):
+    """Compressed, budgeted resume text for embedding in prompts."""
+    return fit_to_budget(compress_resume(text), budget)
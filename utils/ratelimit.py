@@ -0,0 +1,246 @@
+"""Per-host token-bucket rate limiting and circuit breaking for the scrapers,
+and the adaptive concurrency limiter used for LLM calls.
+
+``guard(url, rate)`` returns the (bucket, breaker) pair for the URL's host.
+Both keep counters that ``metrics()`` reports.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+class Throttled(Exception):
+    """Raised when a request would have to wait longer than allowed for a token."""
+
+
+class CircuitOpen(Exception):
+    """Raised when a host's breaker is open and calls are being short-circuited."""
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/second, holding up to ``capacity``.
+
+    A ``rate`` of None means unlimited; only Retry-After pauses apply.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.throttle_wait = 0.0
+        self.retry_after_hits = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Take a token, sleeping until one is available.
+
+        Raises Throttled instead of sleeping if the wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self.blocked_until - now, 0)
+            if self.rate:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = max((1 - self.tokens) / self.rate, wait)
+            if max_wait is not None and wait > max_wait:
+                raise Throttled(f"would wait {wait:.1f}s for a token")
+            # Reserve the token now so concurrent callers queue up behind us.
+            if self.rate:
+                self.tokens -= 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttle_wait += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all requests for ``seconds``, e.g. from a Retry-After header."""
+        with self._lock:
+            self.retry_after_hits += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures for ``reset_timeout`` seconds.
+
+    Once the cool-down has passed a single trial call is let through
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        """True while the breaker is rejecting calls (no side effects)."""
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_neutral(self):
+        """End a call whose outcome says nothing about the host's health."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+INTERACTIVE, BACKGROUND = 0, 1
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by AIMD, with interactive and background lanes.
+
+    Each successful call raises the limit by about one per limit's worth of
+    calls; a throttled call (429 / quota) halves it, at most once per
+    ``cooldown`` seconds so one burst of rejections counts as one signal.
+    Background callers only get a slot when no interactive caller is waiting.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.throttled = 0
+        self.completed = 0
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _can_start(self, priority):
+        if self.in_flight >= int(self.limit):
+            return False
+        return priority == INTERACTIVE or self._waiting[INTERACTIVE] == 0
+
+    def acquire(self, priority=INTERACTIVE, timeout=None):
+        """Wait for a slot; raises Throttled if none frees up within ``timeout``."""
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                if not self._cond.wait_for(lambda: self._can_start(priority), timeout):
+                    raise Throttled(f"no LLM slot free within {timeout}s (limit {int(self.limit)})")
+                self.in_flight += 1
+            finally:
+                self._waiting[priority] -= 1
+
+    def release(self, outcome="ok"):
+        """Free the slot; ``outcome`` is "ok", "throttled" or "error" (limit unchanged)."""
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == "throttled":
+                self.throttled += 1
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            elif outcome == "ok":
+                self.completed += 1
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting_interactive": self._waiting[INTERACTIVE],
+                "waiting_background": self._waiting[BACKGROUND],
+                "throttled": self.throttled,
+                "completed": self.completed,
+            }
+
+
+def backoff(attempt, base=0.5, cap=8.0):
+    """Full-jitter exponential backoff delay for retry number ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+_buckets = {}
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def host_of(url):
+    return urlparse(url).hostname or url
+
+
+def guard(url, rate, capacity=1):
+    """Return the shared (TokenBucket, CircuitBreaker) for ``url``'s host."""
+    host = host_of(url)
+    with _registry_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(rate, capacity)
+            _breakers[host] = CircuitBreaker()
+        return _buckets[host], _breakers[host]
+
+
+def parse_retry_after(value, default=30):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+def metrics():
+    """Per-host throttle and breaker counters."""
+    with _registry_lock:
+        hosts = list(_buckets)
+    report = {}
+    for host in hosts:
+        bucket, breaker = _buckets[host], _breakers[host]
+        report[host] = {
+            "breaker_state": breaker.state,
+            "consecutive_failures": breaker.failures,
+            "breaker_trips": breaker.trips,
+            "rejected": breaker.rejected,
+            "throttled": bucket.throttled,
+            "throttle_wait": round(bucket.throttle_wait, 3),
+            "retry_after": bucket.retry_after_hits,
+        }
+    return report
@@ -0,0 +1,151 @@
+"""Content-addressed store of fetched pages for conditional GETs.
+
+Only responses carrying validators (ETag / Last-Modified) are kept: their
+bodies are saved gzip-compressed under their SHA-256, so identical pages
+fetched for different queries are stored once, and a small SQLite index maps
+each URL to its validators and body digest. Every ``MAINTENANCE_INTERVAL``
+writes, index rows older than ``max_age`` or beyond the newest
+``max_entries`` are dropped along with the bodies no row refers to.
+
+Set RESPONSE_STORE_DIR to choose the location (defaults to the temp dir).
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from utils.cache import SQLiteStore
+
+
+class ResponseStore:
+    MAINTENANCE_INTERVAL = 100
+    # Unreferenced bodies younger than this may belong to a write whose index
+    # row is still on its way, so cleanup leaves them for the next pass.
+    GRACE_PERIOD = 60
+
+    def __init__(self, directory, max_age=86400, max_entries=2000):
+        self.directory = directory
+        self.objects = os.path.join(directory, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self.index = SQLiteStore(os.path.join(directory, "index.db"), table="validators")
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_received = 0
+        self.bytes_saved = 0
+
+    def _path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest + ".gz")
+
+    def validators(self, url):
+        """Stored entry for ``url`` ({"etag", "last_modified", "digest"}) or None."""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        record = entry[0]
+        # The body may have been cleaned up independently of the index.
+        return record if os.path.exists(self._path(record["digest"])) else None
+
+    def conditional_headers(self, url):
+        record = self.validators(url)
+        headers = {}
+        if record:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def read(self, digest):
+        with gzip.open(self._path(digest), "rb") as f:
+            return f.read()
+
+    def write(self, body):
+        """Store ``body`` once under its digest and return the digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        return digest
+
+    def remember(self, url, response):
+        """Store a 200 response's body if it has validators; return the body digest.
+
+        Bodies without validators could never be revalidated, so they are only
+        hashed, which still lets callers key parsed results by content.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return hashlib.sha256(response.content).hexdigest()
+        digest = self.write(response.content)
+        self.index.set(url, {"etag": etag, "last_modified": last_modified, "digest": digest})
+        with self._lock:
+            self._writes += 1
+            maintain = self._writes % self.MAINTENANCE_INTERVAL == 0
+        if maintain:
+            self._maintain()
+        return digest
+
+    def _maintain(self):
+        try:
+            self.index.purge(self.max_age)
+            self.index.trim(self.max_entries)
+            live = {record["digest"] for record in self.index.values()}
+        except sqlite3.Error as e:
+            print("Response store maintenance error:", e)
+            return
+        cutoff = time.time() - self.GRACE_PERIOD
+        for root, _, files in os.walk(self.objects):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.split(".", 1)[0] in live:
+                    continue
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    pass  # Removed by another process meanwhile.
+
+    def record_transfer(self, response, reused=None):
+        """Count bytes received (compressed size when known) and bytes a 304 saved."""
+        size = int(response.headers.get("Content-Length") or len(response.content))
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += size
+            if reused is not None:
+                self.not_modified += 1
+                self.bytes_saved += reused
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "bytes_received": self.bytes_received,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide store, creating its directory and index on first use."""
+    global store
+    if store is None:
+        with _store_lock:
+            if store is None:
+                store = ResponseStore(os.environ.get("RESPONSE_STORE_DIR")
+                                      or os.path.join(tempfile.gettempdir(), "job_responses"))
+    return store
@@ -0,0 +1,128 @@
+"""Resume analysis as one structured Gemini request.
+
+The match score, skills gap, improvement suggestions and interview questions
+are asked for in a single JSON response instead of three prompts that each
+carry the resume and job description. Each UI section is validated on its
+own, and only the sections that fail are re-issued as plain-text prompts.
+"""
+import json
+import re
+
+from utils import llm
+
+SECTIONS = ("score", "improvements", "questions")
+# Fields each UI section is built from.
+SECTION_FIELDS = {
+    "score": ("score", "matching_skills", "missing_skills"),
+    "improvements": ("improvements",),
+    "questions": ("interview_questions",),
+}
+# Metrics tags for the combined call and for each section's fallback prompt.
+FEATURE = "resume_analysis"
+SECTION_FEATURES = {"score": "resume_score", "improvements": "improvement", "questions": "interview_questions"}
+GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0.2}
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def combined_prompt(resume, job_description):
+    return f'''
+    Act as an HR Manager and career coach with 20 years of experience. Compare the resume with the job description.
+    Respond with a single JSON object with exactly these keys:
+    "score": integer 0-10 for how well the resume matches the job,
+    "matching_skills": list of key skills from the job description found in the resume,
+    "missing_skills": list of required skills or qualifications missing from the resume,
+    "improvements": list of specific, actionable changes (keywords to add, skills to emphasize, sections to rephrase),
+    "interview_questions": list of 3 questions to prepare (1 technical, 1 behavioral, 1 role-specific).
+
+    Resume: {resume}
+    Job Description: {job_description}
+    '''
+
+
+def _valid_score(value):
+    if isinstance(value, str) and value.strip().split("/")[0].strip().isdigit():
+        value = int(value.strip().split("/")[0])
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value <= 10
+
+
+def _valid_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+VALIDATORS = {
+    "score": _valid_score,
+    "matching_skills": _valid_list,
+    "missing_skills": _valid_list,
+    "improvements": lambda value: _valid_list(value) and bool(value),
+    "interview_questions": lambda value: _valid_list(value) and bool(value),
+}
+
+
+def parse_response(text):
+    """Return ``(data, failed)``: the decoded object and the UI sections that did not validate."""
+    text = _FENCE_RE.sub("", (text or "").strip())
+    try:
+        data = json.loads(text)
+    except ValueError:
+        start, end = text.find("{"), text.rfind("}")
+        try:
+            data = json.loads(text[start:end + 1]) if start != -1 else None
+        except ValueError:
+            data = None
+    if not isinstance(data, dict):
+        return {}, list(SECTIONS)
+    failed = [
+        section for section in SECTIONS
+        if not all(field in data and VALIDATORS[field](data[field]) for field in SECTION_FIELDS[section])
+    ]
+    return data, failed
+
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items) or "- None"
+
+
+def render_section(section, data):
+    """Markdown for a validated section, in the layout of the plain-text prompts."""
+    if section == "score":
+        score = data["score"]
+        if isinstance(score, str):
+            score = int(score.strip().split("/")[0])
+        return (f"**Score: {score:g}/10**\n\n**Matching Skills:**\n{_bullets(data['matching_skills'])}"
+                f"\n\n**Missing Skills:**\n{_bullets(data['missing_skills'])}")
+    if section == "improvements":
+        return _bullets(data["improvements"])
+    return _bullets(data["interview_questions"])
+
+
+def iter_analysis(resume, job_description, fallback_prompts, client=None, use_cache=True):
+    """Yield ``(section, markdown, error)`` for every section in ``SECTIONS``.
+
+    Sections parsed from the combined response come first; the rest are
+    re-issued concurrently from ``fallback_prompts`` (section -> prompt) and
+    yielded as they complete, with ``error`` set if that call failed too.
+    If the combined call itself fails (rate limit, timeout, ...) nothing is
+    re-issued: every section is yielded with that error, since three more
+    requests would only add to the load that caused it.
+    """
+    client = client or llm.get_client()
+    try:
+        text = client.generate_text(combined_prompt(resume, job_description), use_cache=use_cache,
+                                    feature=FEATURE, generation_config=GENERATION_CONFIG)
+    except llm.LLMError as e:
+        print("Combined resume analysis failed:", e)
+        for section in SECTIONS:
+            yield section, None, e
+        return
+    data, failed = parse_response(text)
+
+    for section in SECTIONS:
+        if section not in failed:
+            yield section, render_section(section, data), None
+    if failed:
+        retry = [fallback_prompts[section] for section in failed]
+        features = [SECTION_FEATURES[section] for section in failed]
+        for index, text, error in llm.iter_generate_concurrently(retry, client=client, features=features,
+                                                                 use_cache=use_cache):
+            yield failed[index], text, error
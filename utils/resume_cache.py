@@ -0,0 +1,76 @@
+"""Parsed resumes keyed by the SHA-256 of the uploaded bytes.
+
+Streamlit reruns the script on every interaction, and users re-analyze the
+same upload against several job descriptions. ``load_resume`` extracts each
+distinct file once and serves the text, sections, skills, contact details and
+token estimate from a bounded LRU afterwards. Set RESUME_CACHE_DB to a file path to keep
+them across restarts and share them between workers. Extraction itself runs
+in the ``utils.parsing`` worker pool.
+"""
+import hashlib
+import os
+
+from utils import ingest, parsing, prompts, resume_structure
+from utils.cache import ResultCache
+
+# Part of every cache key: bump it whenever the shape of ``parse_resume_bytes``
+# output changes, so rows written by older code (kept for days in
+# RESUME_CACHE_DB) are never served to code that expects the new fields.
+SCHEMA_VERSION = 3
+
+parsed_cache = ResultCache(
+    maxsize=64, ttl=7 * 24 * 3600, stale_ttl=0, path=os.environ.get("RESUME_CACHE_DB"), table="parsed_resumes",
+    disk_maxsize=2000,
+)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_upload(uploaded_file):
+    """The raw bytes of a Streamlit upload, path or file object."""
+    if isinstance(uploaded_file, (bytes, bytearray)):
+        return bytes(uploaded_file)
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, "rb") as f:
+            return f.read()
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    data = uploaded_file.read()
+    uploaded_file.seek(0)
+    return data
+
+
+def parse_resume_bytes(data, kind=None):
+    """``ingest.Document`` fields, ``resume_structure`` sections/skills/contact and a token estimate."""
+    parsed = ingest.ingest(data, kind).to_dict()
+    parsed.update(resume_structure.structure(parsed["text"]))
+    parsed["tokens"] = prompts.estimate_tokens(parsed["text"])
+    return parsed
+
+
+def load_resume(uploaded_file, kind=None, timeout=None, cancel=None):
+    """Parsed resume for ``uploaded_file``, extracting it only the first time these bytes are seen.
+
+    The format comes from the file's contents, not its name. Raises
+    ``ingest.UnsupportedFormat`` for other files and ``parsing.ParseError``
+    (or its timeout/cancel subclasses) when extraction fails.
+    """
+    data = read_upload(uploaded_file)
+    kind = kind or ingest.sniff(data)
+    if kind is None:
+        raise ingest.UnsupportedFormat()
+
+    def parse():
+        if parsing.service is None:
+            try:
+                return parse_resume_bytes(data, kind)
+            except parsing.ParseError:
+                raise
+            except Exception as e:
+                raise parsing.ParseError(f"{type(e).__name__}: {e}") from e
+        return parsing.service.parse(data, kind, timeout=timeout, cancel=cancel)
+
+    key = f"v{SCHEMA_VERSION}:{content_hash(data)}"
+    return parsed_cache.get_or_fetch(key, parse, store_if=lambda parsed: bool(parsed["text"].strip()))
@@ -1,21 +1,9 @@
-import docx
-import PyPDF2
-import io
+from utils import ingest, parsing, resume_cache
 
 def parse_resume(uploaded_file):
-    if uploaded_file.name.endswith('.pdf'):
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text.strip()
-    
-    elif uploaded_file.name.endswith('.docx'):
-        doc = docx.Document(uploaded_file)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text.strip()
-    
-    else:
+    try:
+        return resume_cache.load_resume(uploaded_file)["text"].strip()
+    except ingest.UnsupportedFormat:
         return "❌ Unsupported file format."
+    except parsing.ParseError as e:
+        return f"❌ Could not read this file: {e}"
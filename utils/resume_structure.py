@@ -0,0 +1,267 @@
+"""Resume text split into sections, contact details and a normalized skill set.
+
+``structure`` makes one pass over the lines with precompiled patterns:
+headings (see ``prompts.section_name``, including inline ones such as
+"Skills: Python, SQL") open a section, lines before the first heading are
+contact details (or the summary, when they read like prose), and email,
+phone and profile links are taken from those lines and any other line that
+mentions one. Skills are
+matched against a token trie of ``SKILLS`` aliases, longest match first, so
+"machine learning" and "ML" both become "Machine Learning". Aliases that are
+also ordinary words ("go", "r", "excel") only count inside the skills
+section. A few-page resume takes around a millisecond, so this runs
+on every upload (see ``utils.resume_cache``).
+"""
+import re
+
+from utils import prompts
+
+SECTIONS = ("contact", "summary", "skills", "experience", "education", "certifications", "projects")
+
+# Canonical name -> aliases (matched case-insensitively, on whole tokens).
+SKILLS = {
+    "Python": ("python", "python3"),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "js", "es6"),
+    "TypeScript": ("typescript", "ts"),
+    "C": ("c",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    ".NET": (".net", "dotnet", "asp.net"),
+    "Go": ("go", "golang"),
+    "Rust": ("rust",),
+    "Ruby": ("ruby",),
+    "PHP": ("php",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("swift",),
+    "Scala": ("scala",),
+    "R": ("r",),
+    "MATLAB": ("matlab",),
+    "Bash": ("bash", "shell scripting"),
+    "SQL": ("sql",),
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MySQL": ("mysql",),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "Elasticsearch": ("elasticsearch",),
+    "Cassandra": ("cassandra",),
+    "Snowflake": ("snowflake",),
+    "BigQuery": ("bigquery",),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "css3"),
+    "React": ("react", "react.js", "reactjs"),
+    "Angular": ("angular", "angularjs"),
+    "Vue.js": ("vue", "vue.js", "vuejs"),
+    "Node.js": ("node", "node.js", "nodejs"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring": ("spring", "spring boot"),
+    "GraphQL": ("graphql",),
+    "REST APIs": ("rest", "rest api", "rest apis", "restful"),
+    "Microservices": ("microservices",),
+    "AWS": ("aws", "amazon web services"),
+    "Azure": ("azure", "microsoft azure"),
+    "Google Cloud": ("gcp", "google cloud", "google cloud platform"),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "Ansible": ("ansible",),
+    "Jenkins": ("jenkins",),
+    "CI/CD": ("ci cd", "ci", "continuous integration"),
+    "Git": ("git", "github", "gitlab"),
+    "Linux": ("linux", "unix"),
+    "Kafka": ("kafka", "apache kafka"),
+    "Spark": ("spark", "pyspark", "apache spark"),
+    "Hadoop": ("hadoop",),
+    "Airflow": ("airflow", "apache airflow"),
+    "dbt": ("dbt",),
+    "ETL": ("etl", "elt"),
+    "Data Analysis": ("data analysis", "data analytics"),
+    "Data Visualization": ("data visualization", "data visualisation"),
+    "Statistics": ("statistics", "statistical analysis"),
+    "Machine Learning": ("machine learning", "ml"),
+    "Deep Learning": ("deep learning",),
+    "NLP": ("nlp", "natural language processing"),
+    "Computer Vision": ("computer vision",),
+    "Generative AI": ("generative ai", "genai", "llm", "llms", "large language models"),
+    "TensorFlow": ("tensorflow",),
+    "PyTorch": ("pytorch",),
+    "Keras": ("keras",),
+    "scikit-learn": ("scikit learn", "sklearn"),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "A/B Testing": ("a b testing", "ab testing", "experimentation"),
+    "Excel": ("excel", "ms excel", "microsoft excel"),
+    "Power BI": ("power bi", "powerbi"),
+    "Tableau": ("tableau",),
+    "Looker": ("looker",),
+    "Salesforce": ("salesforce",),
+    "SAP": ("sap",),
+    "Jira": ("jira",),
+    "Figma": ("figma",),
+    "Selenium": ("selenium",),
+    "Android": ("android",),
+    "iOS": ("ios",),
+    "Agile": ("agile", "scrum", "kanban"),
+    "Project Management": ("project management", "pmp"),
+    "Product Management": ("product management",),
+    "Digital Marketing": ("digital marketing",),
+    "SEO": ("seo", "search engine optimization"),
+    "Cybersecurity": ("cybersecurity", "cyber security", "information security"),
+    "Networking": ("networking", "tcp ip"),
+    "Communication": ("communication", "communication skills"),
+    "Leadership": ("leadership", "team leadership"),
+    "Stakeholder Management": ("stakeholder management",),
+    "Problem Solving": ("problem solving",),
+}
+# Aliases that are also ordinary words (or single letters): outside a skills
+# list they only count when capitalized ("Go", "Spark") and not directly
+# followed by "&" or "-" ("R&D", "Go-to"), and single letters never do
+# ("C-level", "Vitamin C").
+AMBIGUOUS = frozenset({"c", "go", "r", "swift", "rust", "ruby", "spring", "excel", "spark", "node", "rest", "ci",
+                       "js", "ts", "sap"})
+
+_TOKEN_RE = re.compile(r"\.net\b|[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{7,}\d(?!\w)")
+_LINK_RE = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com)/[\w/.-]+|https?://\S+",
+                      re.IGNORECASE)
+_INLINE_HEADING_RE = re.compile(r"^([A-Za-z &]{3,40}?)\s*:\s*(\S.*)$")
+_LIST_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*")
+_CONTACT_MARKERS = ("@", "http", "www.", "linkedin", "github", "phone", "mobile", "tel")
+_END = ""
+
+
+def _build_trie(skills):
+    trie = {}
+    for name, aliases in skills.items():
+        for alias in aliases:
+            node = trie
+            for token in _TOKEN_RE.findall(alias.lower()):
+                node = node.setdefault(token, {})
+            node[_END] = (name, alias in AMBIGUOUS)
+    return trie
+
+
+_TRIE = _build_trie(SKILLS)
+
+
+def _incidental(text, word, end, length):
+    # An ambiguous alias used as an ordinary word rather than a skill name.
+    return not word[:1].isupper() or (length == 1 and len(word) == 1) or text[end:end + 1] in ("&", "-")
+
+
+def extract_skills(text, strict=True):
+    """Canonical skills mentioned in ``text``, in order of first mention.
+
+    With ``strict`` the ``AMBIGUOUS`` aliases only match as described above;
+    pass False for text that is known to be a skills list.
+    """
+    spans = list(_TOKEN_RE.finditer(text))
+    words = [span.group() for span in spans]
+    tokens = [word.lower() for word in words]
+    found = {}
+    i, count = 0, len(tokens)
+    while i < count:
+        node, j, match = _TRIE, i, None
+        while j < count and tokens[j] in node:
+            node = node[tokens[j]]
+            j += 1
+            if _END in node:
+                match = (node[_END], j)
+        if match is None:
+            i += 1
+            continue
+        (name, ambiguous), end = match
+        if not (strict and ambiguous and _incidental(text, words[i], spans[end - 1].end(), end - i)):
+            found.setdefault(name, None)
+        i = end
+    return list(found)
+
+
+def _heading(line):
+    name = prompts.section_name(line)
+    if name:
+        return name, ""
+    match = _INLINE_HEADING_RE.match(line)
+    if match:
+        name = prompts.section_name(match.group(1))
+        if name:
+            return name, match.group(2)
+    return None, line
+
+
+def _contact_details(contact_lines):
+    text = "\n".join(contact_lines)
+    links = [link.rstrip(".,)") for link in _LINK_RE.findall(text)]
+    contact = {
+        "name": "",
+        "email": next(iter(_EMAIL_RE.findall(text)), ""),
+        "phone": next((" ".join(p.split()) for p in _PHONE_RE.findall(text) if sum(c.isdigit() for c in p) >= 9),
+                      ""),
+        "linkedin": next((link for link in links if "linkedin.com" in link.lower()), ""),
+        "links": links,
+    }
+    for line in contact_lines[:5]:
+        candidate = _LIST_SPLIT_RE.split(line)[0].strip()
+        words = candidate.split()
+        if 2 <= len(words) <= 4 and all(word[:1].isalpha() for word in words) and "@" not in candidate:
+            contact["name"] = candidate
+            break
+    return contact
+
+
+def structure(text):
+    """``{"sections", "skills", "contact"}`` for resume ``text``.
+
+    ``sections`` maps section names (``SECTIONS`` plus any other heading
+    ``prompts.section_name`` knows) to their text without the heading.
+    """
+    sections = {}
+    contact_lines = []
+    current = "contact"
+    for line in prompts.compress_resume(text).splitlines():
+        if current == "contact" or any(marker in line.lower() for marker in _CONTACT_MARKERS):
+            contact_lines.append(line)
+        name, rest = _heading(line)
+        if name:
+            current = name
+            if not rest:
+                continue
+        elif current == "contact" and len(line.split()) > 12 and "@" not in line:
+            # Prose before the first heading is an untitled summary, not contact details.
+            current = "summary"
+        sections.setdefault(current, []).append(rest)
+    sections = {name: "\n".join(lines) for name, lines in sections.items()}
+
+    skills = extract_skills(sections.get("skills", ""), strict=False)
+    for name in extract_skills("\n".join(body for key, body in sections.items() if key != "skills")):
+        if name not in skills:
+            skills.append(name)
+    return {
+        "sections": sections,
+        "skills": skills,
+        "contact": _contact_details(contact_lines),
+    }
+
+
+def section_text(sections, names, separator="\n\n"):
+    """The named sections of a structured resume, each under its heading, in ``names`` order."""
+    return separator.join(f"{name.upper()}:\n{sections[name]}" for name in names if sections.get(name))
+
+
+def match_skills(resume_skills, job_description):
+    """Local skill overlap with a job description: ``{"score", "matched", "missing"}``.
+
+    ``score`` is the share of the job's recognised skills the resume lists,
+    out of 10, or None when the description names none.
+    """
+    wanted = extract_skills(job_description)
+    have = set(resume_skills)
+    matched = [name for name in wanted if name in have]
+    return {
+        "score": round(10 * len(matched) / len(wanted), 1) if wanted else None,
+        "matched": matched,
+        "missing": [name for name in wanted if name not in have],
+    }
@@ -1,90 +1,263 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin
 
-def scrape_internshala(keyword):
-    try:
-        url = f"https://internshala.com/internships/keywords-{keyword.replace(' ', '-')}/"
-        r = requests.get(url)
-        soup = BeautifulSoup(r.content, "html.parser")
-        jobs = []
-        cards = soup.select(".internship_meta")
-        for card in cards[:5]:
-            title_tag = card.find_previous("a", class_="view_detail_button")
-            company_tag = card.find_previous("div", class_="company_name")
-            if title_tag and company_tag:
-                jobs.append({
-                    "Title": title_tag.text.strip(),
-                    "Company": company_tag.text.strip(),
-                    "Platform": "Internshala",
-                    "Link": "https://internshala.com" + title_tag["href"]
-                })
-        return jobs
-    except Exception as e:
-        print("Internshala Error:", e)
-        return []
-
-def scrape_indeed(keyword, location):
-    try:
-        url = f"https://www.indeed.com/jobs?q={keyword}&l={location}"
-        r = requests.get(url)
-        soup = BeautifulSoup(r.content, "html.parser")
-        jobs = []
-        cards = soup.select("a.tapItem")
-        for card in cards[:5]:
-            title = card.find("h2").text.strip() if card.find("h2") else "No Title"
-            company = card.find("span", class_="companyName").text.strip() if card.find("span", class_="companyName") else "Unknown"
-            link = "https://www.indeed.com" + card["href"]
-            jobs.append({
-                "Title": title,
-                "Company": company,
-                "Platform": "Indeed",
-                "Link": link
-            })
-        return jobs
-    except Exception as e:
-        print("Indeed Error:", e)
-        return []
-
-def scrape_naukri(keyword, location):
-    try:
-        url = f"https://www.naukri.com/{keyword.replace(' ', '-')}-jobs-in-{location.replace(' ', '-')}"
-        r = requests.get(url)
-        soup = BeautifulSoup(r.content, "html.parser")
-        jobs = []
-        cards = soup.select("article.jobTuple")
-        for card in cards[:5]:
-            title = card.find("a", class_="title").text.strip()
-            company = card.find("a", class_="subTitle").text.strip()
-            link = card.find("a", class_="title")["href"]
-            jobs.append({
-                "Title": title,
-                "Company": company,
-                "Platform": "Naukri",
-                "Link": link
-            })
-        return jobs
-    except Exception as e:
-        print("Naukri Error:", e)
-        return []
-
-def scrape_timesjobs(keyword, location):
+from utils import dedup, ratelimit, response_store, transport
+from utils.boards import BOARDS
+from utils.cache import LRUCache, ResultCache
+from utils.html_parsing import parse_cards, select_attr, select_text
+from utils.jobs import JobPosting, to_records
+
+# Default per-board deadline in seconds, also used as the HTTP timeout.
+DEFAULT_TIMEOUT = 10
+# Default number of jobs returned per board.
+DEFAULT_LIMIT = 5
+
+# ----------------- BOARD ENGINE -----------------
+def slugify(text):
+    return (text or "").strip().replace(" ", "-")
+
+def page_url(board, keyword, location, page=1):
+    """Build the results URL for ``page`` (1-based) of a board search."""
+    spec = BOARDS[board]
+    template = spec["url"]
+    if page > 1:
+        template = spec["pagination"]["url"]
+    page_size = spec.get("pagination", {}).get("page_size", 0)
+    return template.format(
+        base=spec["base_url"],
+        keyword=keyword,
+        location=location,
+        keyword_slug=slugify(keyword),
+        location_slug=slugify(location),
+        page=page,
+        offset=(page - 1) * page_size,
+    )
+
+def extract_job(board, card, url):
+    """Build a JobPosting from one card, or None if a required field is missing."""
+    spec = BOARDS[board]
+    fields = {}
+    for key, (selector, attr, default) in spec["fields"].items():
+        value = select_attr(card, selector, attr) if attr else select_text(card, selector)
+        if not value:
+            if default is None:
+                return None
+            value = default
+        fields[key] = value
+    fields["Platform"] = spec["platform"]
+    if "Link" in fields:
+        fields["Link"] = urljoin(url, fields["Link"])
+    return JobPosting.from_dict(fields)
+
+# Responses that mean the host is refusing us: rate limits and the 401/403/451
+# pages boards serve to blocked scrapers. These count as breaker failures.
+BLOCKED_STATUSES = (401, 403, 429, 451)
+
+# (board, body digest) -> jobs parsed from that exact page, reused on 304s and
+# for identical pages returned to different queries.
+_page_jobs = LRUCache(maxsize=256)
+
+def fetch_page(board, url, timeout=DEFAULT_TIMEOUT):
+    """Fetch one results page and return the jobs on it.
+
+    Requests wait for the host's token bucket, and raise CircuitOpen while the
+    host's breaker is cooling down. Block responses (``BLOCKED_STATUSES``) and
+    5xx count as breaker failures, and 429/503 also pause the bucket for the
+    Retry-After period. Pages are fetched conditionally against the response
+    store, so an unchanged page costs a 304 and no re-parse.
+    """
+    spec = BOARDS[board]
+    bucket, breaker = ratelimit.guard(url, spec.get("rate_limit"))
+    if breaker.is_open():
+        raise ratelimit.CircuitOpen(f"{spec['platform']} is cooling down after repeated failures")
+    # Wait for the token before claiming the breaker's half-open trial, so a
+    # Throttled here cannot leave the trial claimed with no outcome recorded.
+    bucket.acquire(max_wait=timeout)
+    if not breaker.allow():
+        raise ratelimit.CircuitOpen(f"{spec['platform']} is cooling down after repeated failures")
     try:
-        url = f"https://www.timesjobs.com/candidate/job-search.html?searchType=personalizedSearch&txtKeywords={keyword}&txtLocation={location}"
-        r = requests.get(url)
-        soup = BeautifulSoup(r.content, "html.parser")
-        jobs = []
-        cards = soup.select(".job-bx")
-        for card in cards[:5]:
-            title = card.find("h2").text.strip()
-            company = card.find("h3", class_="joblist-comp-name").text.strip()
-            link = card.find("a")["href"]
-            jobs.append({
-                "Title": title,
-                "Company": company,
-                "Platform": "TimesJobs",
-                "Link": link
-            })
-        return jobs
-    except Exception as e:
-        print("TimesJobs Error:", e)
-        return []
+        r, body, digest = transport.conditional_get(url, response_store.get_store(), timeout=timeout)
+    except Exception:
+        breaker.record_failure()
+        raise
+    if r.status_code in (429, 503):
+        bucket.pause(ratelimit.parse_retry_after(r.headers.get("Retry-After")))
+    if r.status_code in BLOCKED_STATUSES or r.status_code >= 500:
+        breaker.record_failure()
+    elif r.ok or r.status_code == 304:
+        breaker.record_success()
+    else:
+        breaker.record_neutral()
+    r.raise_for_status()
+
+    key = f"{board}|{digest}"
+    cached = _page_jobs.get(key) if digest else None
+    if cached is not None:
+        return cached[0]
+    jobs = [job for job in (extract_job(board, card, url) for card in parse_cards(body, *spec["card"])) if job]
+    if digest:
+        _page_jobs.set(key, jobs)
+    return jobs
+
+def board_available(board):
+    """False while the board's circuit breaker is open."""
+    spec = BOARDS[board]
+    _, breaker = ratelimit.guard(spec["base_url"], spec.get("rate_limit"))
+    return not breaker.is_open()
+
+class _PageWalk:
+    """The page loop shared by ``iter_jobs`` and ``aiter_jobs``.
+
+    ``urls()`` yields the pages to fetch and ``take(jobs)`` returns the new
+    jobs on a fetched page, so both variants stop at the same point.
+    """
+
+    def __init__(self, board, keyword, location, limit, max_pages, cancel):
+        self.board, self.keyword, self.location = board, keyword, location
+        self.pages = max_pages if "pagination" in BOARDS[board] else 1
+        self.limit = limit
+        self.cancel = cancel
+        self.seen = set()
+        self.count = 0
+        self.done = False
+
+    def urls(self):
+        for page in range(1, self.pages + 1):
+            if self.done or (self.cancel is not None and self.cancel.is_set()):
+                return
+            yield page_url(self.board, self.keyword, self.location, page)
+
+    def take(self, jobs):
+        # Boards often repeat the last page past the end, so skip links already yielded.
+        new = []
+        for job in jobs:
+            if job.link not in self.seen:
+                self.seen.add(job.link)
+                new.append(job)
+        if self.limit is not None:
+            new = new[:self.limit - self.count]
+        self.count += len(new)
+        self.done = not new or (self.limit is not None and self.count >= self.limit)
+        return new
+
+def iter_jobs(board, keyword, location, limit=None, max_pages=10, timeout=DEFAULT_TIMEOUT, cancel=None):
+    """Yield jobs from ``board`` one at a time, following its pagination rule.
+
+    Stops after ``limit`` jobs, ``max_pages`` pages, a page with no new jobs,
+    or once ``cancel`` (a threading.Event) is set. Closing the generator early
+    also means no further pages are requested.
+    """
+    walk = _PageWalk(board, keyword, location, limit, max_pages, cancel)
+    for url in walk.urls():
+        try:
+            jobs = fetch_page(board, url, timeout)
+        except Exception as e:
+            print(f"{BOARDS[board]['platform']} Error:", e)
+            return
+        yield from walk.take(jobs)
+
+async def aiter_jobs(board, keyword, location, limit=None, max_pages=10, timeout=DEFAULT_TIMEOUT, cancel=None):
+    """Async-generator variant of ``iter_jobs``; page fetches run in a worker thread."""
+    walk = _PageWalk(board, keyword, location, limit, max_pages, cancel)
+    for url in walk.urls():
+        try:
+            jobs = await asyncio.to_thread(fetch_page, board, url, timeout)
+        except Exception as e:
+            print(f"{BOARDS[board]['platform']} Error:", e)
+            return
+        for job in walk.take(jobs):
+            yield job
+
+def fetch_jobs(board, keyword, location, limit=DEFAULT_LIMIT, timeout=DEFAULT_TIMEOUT):
+    """Return up to ``limit`` jobs from ``board``, reading further pages only if needed."""
+    return list(iter_jobs(board, keyword, location, limit=limit, timeout=timeout))
+
+# ----------------- RESULT CACHE -----------------
+# Set JOB_CACHE_DB to a file path to share cached results across worker processes.
+# Stale results are still served for stale_ttl seconds while a background refresh runs.
+job_cache = ResultCache(
+    maxsize=512, ttl=900, stale_ttl=3600, path=os.environ.get("JOB_CACHE_DB"), table="jobs",
+    encode=to_records, decode=lambda records: [JobPosting.from_dict(record) for record in records],
+)
+
+def normalize_query(text):
+    """Lower-case and collapse whitespace so equivalent searches share a cache entry."""
+    return " ".join((text or "").lower().split())
+
+def cache_key(board, keyword, location, limit=DEFAULT_LIMIT):
+    return f"{board}|{normalize_query(keyword)}|{normalize_query(location)}|{limit}"
+
+def scrape(board, keyword, location, timeout=DEFAULT_TIMEOUT, use_cache=True, limit=DEFAULT_LIMIT):
+    """Scrape one board, serving repeat queries from ``job_cache``."""
+    fetch = lambda: fetch_jobs(board, keyword, location, limit, timeout)
+    if not use_cache:
+        return fetch()
+    key = cache_key(board, keyword, location, limit)
+    if not board_available(board):
+        # Serve whatever we last had rather than waiting on a board that is failing.
+        return job_cache.peek(key) or []
+    return job_cache.get_or_fetch(key, fetch, ttl=BOARDS[board].get("ttl"))
+
+def scrape_internshala(keyword, timeout=DEFAULT_TIMEOUT, limit=DEFAULT_LIMIT):
+    return scrape("internshala", keyword, "", timeout, limit=limit)
+
+def scrape_indeed(keyword, location, timeout=DEFAULT_TIMEOUT, limit=DEFAULT_LIMIT):
+    return scrape("indeed", keyword, location, timeout, limit=limit)
+
+def scrape_naukri(keyword, location, timeout=DEFAULT_TIMEOUT, limit=DEFAULT_LIMIT):
+    return scrape("naukri", keyword, location, timeout, limit=limit)
+
+def scrape_timesjobs(keyword, location, timeout=DEFAULT_TIMEOUT, limit=DEFAULT_LIMIT):
+    return scrape("timesjobs", keyword, location, timeout, limit=limit)
+
+# ----------------- CONCURRENT FAN-OUT -----------------
+# Shared pool so repeated searches don't pay thread start-up each time.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="scraper")
+
+def iter_scrape_all(keyword, location, boards=None, board_timeouts=None, deadline=15, use_cache=True, limit=DEFAULT_LIMIT):
+    """Run the board scrapers concurrently and yield (board, jobs) as each one finishes.
+
+    Boards that miss their own deadline (``board_timeouts``, falling back to
+    DEFAULT_TIMEOUT) or the overall ``deadline`` are skipped, so callers always
+    get whatever finished in time.
+    """
+    boards = list(boards or BOARDS)
+    board_timeouts = board_timeouts or {}
+    start = time.monotonic()
+    overall = start + deadline
+
+    pending = {}
+    for board in boards:
+        if board not in BOARDS:
+            print("Unknown board:", board)
+            continue
+        timeout = board_timeouts.get(board, DEFAULT_TIMEOUT)
+        future = _executor.submit(scrape, board, keyword, location, timeout, use_cache, limit)
+        pending[future] = (board, min(start + timeout, overall))
+
+    while pending:
+        now = time.monotonic()
+        for future, (board, board_deadline) in list(pending.items()):
+            if board_deadline <= now and not future.done():
+                print(f"{board} timed out after {now - start:.1f}s")
+                del pending[future]
+        if not pending:
+            break
+        nearest = min(board_deadline for _, board_deadline in pending.values())
+        done, _ = wait(pending, timeout=max(0, nearest - now), return_when=FIRST_COMPLETED)
+        for future in done:
+            board, _ = pending.pop(future)
+            yield board, future.result()
+
+def scrape_all(keyword, location, boards=None, board_timeouts=None, deadline=15, use_cache=True, limit=DEFAULT_LIMIT, dedupe=True):
+    """Scrape every board concurrently and return the combined job list.
+
+    With ``dedupe`` the same posting found on several boards is kept once.
+    """
+    jobs = []
+    for _, board_jobs in iter_scrape_all(keyword, location, boards, board_timeouts, deadline, use_cache, limit):
+        jobs.extend(board_jobs)
+    return dedup.dedupe(jobs) if dedupe else jobs
@@ -0,0 +1,169 @@
+"""Per-feature instrumentation of LLM calls.
+
+Every call records its feature tag, latency, time to first token, input and
+output tokens, cache status and error class. ``LLMMetrics`` keeps running
+aggregates for the Prometheus text format, the recent calls for the
+dashboard, and optionally appends each call to a JSON lines log.
+"""
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+
+class _Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class _FeatureStats:
+    def __init__(self):
+        self.calls = {}  # (cache, error) -> count
+        self.latency = _Histogram()
+        self.ttft = _Histogram()
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))]
+
+
+def _labels(**labels):
+    body = ",".join(f'{key}="{str(value).replace(chr(34), "")}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+class LLMMetrics:
+    def __init__(self, log_path=None, history=2000):
+        self.log_path = log_path
+        self.recent = deque(maxlen=history)
+        self._features = {}
+        self._lock = threading.Lock()
+
+    def record(self, feature, latency, ttft=None, prompt_tokens=0, output_tokens=0, cache="miss", error="",
+               model=""):
+        """Record one call. ``cache`` is hit, stale, miss, coalesced or bypass; ``error`` the error class name."""
+        entry = {
+            "at": round(time.time(), 3),
+            "feature": feature,
+            "model": model,
+            "latency": round(latency, 4),
+            "ttft": round(ttft if ttft is not None else latency, 4),
+            "prompt_tokens": prompt_tokens or 0,
+            "output_tokens": output_tokens or 0,
+            "cache": cache,
+            "error": error,
+        }
+        with self._lock:
+            stats = self._features.setdefault(feature, _FeatureStats())
+            outcome = (cache, error)
+            stats.calls[outcome] = stats.calls.get(outcome, 0) + 1
+            stats.latency.observe(entry["latency"])
+            stats.ttft.observe(entry["ttft"])
+            stats.prompt_tokens += entry["prompt_tokens"]
+            stats.output_tokens += entry["output_tokens"]
+            self.recent.append(entry)
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a", encoding="utf-8") as log:
+                        log.write(json.dumps(entry) + "\n")
+                except OSError as e:
+                    print("Could not write LLM metrics log:", e)
+        return entry
+
+    def summary(self):
+        """One row per feature for the dashboard, slowest p95 first."""
+        with self._lock:
+            recent = list(self.recent)
+            rows = []
+            for name, stats in self._features.items():
+                calls = sum(stats.calls.values())
+                latencies = [e["latency"] for e in recent if e["feature"] == name and not e["error"]]
+                ttfts = [e["ttft"] for e in recent if e["feature"] == name and not e["error"]]
+                rows.append({
+                    "feature": name,
+                    "calls": calls,
+                    "errors": sum(n for (_, error), n in stats.calls.items() if error),
+                    "cache_hit_rate": round(sum(n for (cache, _), n in stats.calls.items()
+                                                if cache in ("hit", "stale", "coalesced")) / calls, 3),
+                    "p50_latency": _percentile(latencies, 50),
+                    "p95_latency": _percentile(latencies, 95),
+                    "p50_ttft": _percentile(ttfts, 50),
+                    "prompt_tokens": stats.prompt_tokens,
+                    "output_tokens": stats.output_tokens,
+                })
+        return sorted(rows, key=lambda row: row["p95_latency"] or 0, reverse=True)
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP llm_calls_total LLM calls by feature, cache status and error class.",
+            "# TYPE llm_calls_total counter",
+        ]
+        with self._lock:
+            features = sorted(self._features.items())
+            for name, stats in features:
+                for (cache, error), count in sorted(stats.calls.items()):
+                    lines.append(f"llm_calls_total{_labels(feature=name, cache=cache, error=error)} {count}")
+            lines += ["# HELP llm_tokens_total Tokens reported by the API.", "# TYPE llm_tokens_total counter"]
+            for name, stats in features:
+                lines.append(f"llm_tokens_total{_labels(feature=name, kind='input')} {stats.prompt_tokens}")
+                lines.append(f"llm_tokens_total{_labels(feature=name, kind='output')} {stats.output_tokens}")
+            for metric, attr, help_text in (("llm_latency_seconds", "latency", "End-to-end call latency."),
+                                            ("llm_ttft_seconds", "ttft", "Time to first token.")):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for name, stats in features:
+                    histogram = getattr(stats, attr)
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{metric}_bucket{_labels(feature=name, le=bound)} {count}")
+                    lines.append(f"{metric}_bucket{_labels(feature=name, le='+Inf')} {histogram.count}")
+                    lines.append(f"{metric}_sum{_labels(feature=name)} {histogram.total:.4f}")
+                    lines.append(f"{metric}_count{_labels(feature=name)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+_server = None
+
+
+def serve(metrics, port, host="0.0.0.0"):
+    """Expose ``metrics.prometheus()`` at http://host:port/metrics from a daemon thread (once per process)."""
+    global _server
+    if _server is not None:
+        return _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    _server = ThreadingHTTPServer((host, port), Handler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, daemon=True, name="llm-metrics").start()
+    return _server
@@ -0,0 +1,187 @@
+"""Shared HTTP transport for the job board scrapers.
+
+Every scraper goes through one pooled ``requests.Session`` so repeated searches
+reuse keep-alive connections to the same hosts instead of paying a fresh
+TCP+TLS handshake each time. Counters for pool hits/misses and connect time
+are kept in ``stats``.
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds.
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+POOL_MAXSIZE = 10
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+class TransportStats:
+    """Thread-safe counters for connection pool usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connects = 0
+            self.connect_time = 0.0
+            self.hosts = {}
+
+    def record_checkout(self, host):
+        with self._lock:
+            self.requests += 1
+            self._host(host)["requests"] += 1
+
+    def record_connect(self, host, elapsed):
+        with self._lock:
+            self.connects += 1
+            self.connect_time += elapsed
+            entry = self._host(host)
+            entry["connects"] += 1
+            entry["connect_time"] += elapsed
+
+    def _host(self, host):
+        return self.hosts.setdefault(host, {"requests": 0, "connects": 0, "connect_time": 0.0})
+
+    def snapshot(self):
+        """Return a plain dict of the counters; a pool hit is a checkout that needed no new connection."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "pool_hits": self.requests - self.connects,
+                "pool_misses": self.connects,
+                "connect_time": round(self.connect_time, 4),
+                "avg_connect_time": round(self.connect_time / self.connects, 4) if self.connects else 0.0,
+                "hosts": {host: dict(entry) for host, entry in self.hosts.items()},
+            }
+
+
+stats = TransportStats()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        stats.record_connect(self.host, time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        stats.record_connect(self.host, time.perf_counter() - start)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+    def _get_conn(self, timeout=None):
+        stats.record_checkout(self.host)
+        return super()._get_conn(timeout)
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _get_conn(self, timeout=None):
+        stats.record_checkout(self.host)
+        return super()._get_conn(timeout)
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools report to ``stats``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def build_session(retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, pool_maxsize=POOL_MAXSIZE):
+    """Create a keep-alive session with retry-with-backoff on transient errors."""
+    retry = Retry(
+        total=retries,
+        # A slow read is left to the caller's deadline rather than repeated.
+        read=0,
+        backoff_factor=backoff,
+        # 429/503 are not retried here: honouring Retry-After inside the request
+        # would block past the caller's deadline. Callers pause their token
+        # bucket for Retry-After instead (see utils.scrapers.fetch_page).
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = PooledAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        # gzip/deflate always; br/zstd too when brotli/zstandard are installed.
+        "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def configure(**kwargs):
+    """Replace the shared session, e.g. ``configure(retries=0, pool_maxsize=4)``."""
+    global _session
+    with _session_lock:
+        old, _session = _session, build_session(**kwargs)
+    if old is not None:
+        old.close()
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET ``url`` through the shared pooled session."""
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+
+def conditional_get(url, store, timeout=DEFAULT_TIMEOUT):
+    """GET ``url`` sending the validators held in ``store`` (a ResponseStore).
+
+    Returns ``(response, body, digest)``. On a 304 the body is read back from
+    the store; ``digest`` is None for responses other than 200 and 304.
+    """
+    r = get(url, timeout=timeout, headers=store.conditional_headers(url))
+    if r.status_code == 304:
+        record = store.validators(url)
+        if record is not None:
+            body = store.read(record["digest"])
+            store.record_transfer(r, reused=len(body))
+            return r, body, record["digest"]
+        r = get(url, timeout=timeout)
+    store.record_transfer(r)
+    if r.status_code != 200:
+        return r, r.content, None
+    return r, r.content, store.remember(url, r)